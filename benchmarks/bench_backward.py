@@ -0,0 +1,33 @@
+"""
+Times Value.backward() on a deep chain graph of 10^3 .. 10^6 nodes.
+
+A chain is the worst case for graph depth: every node has exactly one
+parent, so a recursive traversal would need one Python frame per node.
+
+    python benchmarks/bench_backward.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.engine import Value
+
+def chain(n):
+    x = Value(1.0)
+    y = x
+    for _ in range(n):
+        y = y + 1.0
+    return x, y
+
+if __name__ == '__main__':
+    print(f"{'depth':>10} {'build (s)':>10} {'backward (s)':>13}")
+    for exp in range(3, 7):
+        n = 10**exp
+        t0 = time.perf_counter()
+        x, y = chain(n)
+        t1 = time.perf_counter()
+        y.backward()
+        t2 = time.perf_counter()
+        assert x.grad == 1
+        print(f"{n:>10} {t1 - t0:>10.3f} {t2 - t1:>13.3f}")
@@ -0,0 +1,35 @@
+"""
+Peak RSS and time of one full-batch forward + backward of a deep MLP,
+for different MLP(checkpoint_every=k) settings. Each setting runs in a
+fresh process so ru_maxrss measures only that setting.
+
+    python benchmarks/bench_checkpoint.py
+"""
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.nn import MLP
+
+def run(k):
+    random.seed(0)
+    model = MLP(2, [32] * 8 + [1], checkpoint_every=k)
+    X = [[random.uniform(-2, 2), random.uniform(-2, 2)] for _ in range(50)]
+    t0 = time.perf_counter()
+    loss = sum((model(x)**2 for x in X))
+    loss.backward()
+    t = time.perf_counter() - t0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss # KB on Linux
+    print(f"{k:>17} {rss / 1024:>13.1f} {t:>9.2f}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run(int(sys.argv[1]))
+    else:
+        print(f"{'checkpoint_every':>17} {'peak RSS MB':>13} {'time (s)':>9}")
+        for k in [0, 4, 2, 1]:
+            subprocess.run([sys.executable, __file__, str(k)], check=True)
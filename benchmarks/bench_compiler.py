@@ -0,0 +1,32 @@
+"""
+Times forward + backward of an MLP([2,16,16,1]) on one sample through the
+interpreted graph versus the compiled straight-line version.
+
+    python benchmarks/bench_compiler.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.nn import MLP
+from micrograd.compiler import compile
+
+if __name__ == '__main__':
+    random.seed(0)
+    model = MLP(2, [16, 16, 1])
+    X = [[random.uniform(-2, 2), random.uniform(-2, 2)] for _ in range(200)]
+
+    t0 = time.perf_counter()
+    for x in X:
+        model(x).backward()
+    t1 = time.perf_counter()
+    cf = compile(lambda x0, x1: model([x0, x1]))
+    cf(*X[0])
+    t2 = time.perf_counter()
+    for x in X:
+        cf(*x)
+    t3 = time.perf_counter()
+    print(f"interpreted: {(t1 - t0) / len(X) * 1e3:.3f} ms/sample")
+    print(f"compiled:    {(t3 - t2) / len(X) * 1e3:.3f} ms/sample (compile: {(t2 - t1) * 1e3:.1f} ms)")
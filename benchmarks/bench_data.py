@@ -0,0 +1,56 @@
+"""
+Epoch time of a small MLP trained from a streamed CSV file with and without
+background prefetch, reading from local disk and from a simulated slow
+store (a sleep per 256 rows read, like a network filesystem).
+
+    python benchmarks/bench_data.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.data import CSVSource, DataLoader
+from micrograd.nn import MLP
+from micrograd.optim import SGD
+
+class SlowSource:
+    # wraps a source, waiting latency seconds every 256 samples
+    def __init__(self, source, latency):
+        self.source = source
+        self.latency = latency
+
+    def __iter__(self):
+        for i, sample in enumerate(self.source):
+            if i % 256 == 0:
+                time.sleep(self.latency)
+            yield sample
+
+def epoch(model, opt, loader):
+    t0 = time.perf_counter()
+    for X, y in loader:
+        scores = [model(x) for x in X]
+        loss = sum((1 + -yi * si).relu() for yi, si in zip(y, scores)) * (1.0 / len(X))
+        opt.zero_grad()
+        loss.backward()
+        opt.step()
+    return time.perf_counter() - t0
+
+if __name__ == '__main__':
+    rng = random.Random(0)
+    path = os.path.join(tempfile.mkdtemp(), 'data.csv')
+    with open(path, 'w') as f:
+        for _ in range(4096):
+            x0, x1 = rng.uniform(-1, 1), rng.uniform(-1, 1)
+            f.write(f'{x0!r},{x1!r},{1.0 if x0 * x1 > 0 else -1.0}\n')
+
+    print(f"{'source':>16} {'prefetch':>9} {'epoch (s)':>10}")
+    for name, source in [('local csv', CSVSource(path)), ('slow store', SlowSource(CSVSource(path), 0.02))]:
+        for depth in (0, 4):
+            random.seed(0)
+            model = MLP(2, [8, 1])
+            opt = SGD(model.parameters(), lr=0.05)
+            loader = DataLoader(source, batch_size=32, shuffle_buffer=512, prefetch=depth, seed=0)
+            print(f"{name:>16} {depth:>9} {epoch(model, opt, loader):>10.3f}")
@@ -0,0 +1,48 @@
+"""
+Latency and peak memory of MLP([2,16,16,1]) inference with and without
+no_grad, for single samples and for one (batch, 2) array.
+
+    python benchmarks/bench_inference.py
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.engine import no_grad
+from micrograd.nn import MLP
+
+class nullcontext:
+    def __enter__(self): pass
+    def __exit__(self, *exc): pass
+
+def measure(fn):
+    t0 = time.perf_counter()
+    fn()
+    t = time.perf_counter() - t0
+    tracemalloc.start()
+    out = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return t, peak
+
+if __name__ == '__main__':
+    random.seed(0)
+    model = MLP(2, [16, 16, 1])
+    X = np.random.uniform(-2, 2, (256, 2))
+    rows = X.tolist()
+    print(f"{'':>22} {'ms':>9} {'peak KB':>9}")
+    for mode, ctx in [('graph', nullcontext), ('no_grad', no_grad)]:
+        def single():
+            with ctx():
+                return [model(x) for x in rows]
+        def batched():
+            with ctx():
+                return model(X)
+        for name, fn in [('single x256', single), ('batched 256', batched)]:
+            t, peak = measure(fn)
+            print(f"{mode + ' ' + name:>22} {t * 1e3:>9.2f} {peak / 1024:>9.1f}")
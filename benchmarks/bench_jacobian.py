@@ -0,0 +1,36 @@
+"""
+Jacobian of a Layer(16, nout) at one input: jacobian() (one graph, one
+sweep with vector gradients) against rebuilding the graph and calling
+backward() once per output.
+
+    python benchmarks/bench_jacobian.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.engine import Value, jacobian
+from micrograd.nn import Layer
+
+def per_output(layer, x):
+    rows = []
+    for i in range(len(layer.neurons)):
+        xs = [Value(v) for v in x]
+        layer(xs)[i].backward()
+        rows.append([v.grad for v in xs])
+    return rows
+
+if __name__ == '__main__':
+    random.seed(0)
+    x = [random.uniform(-1, 1) for _ in range(16)]
+    print(f"{'outputs':>8} {'jacobian (ms)':>14} {'N x backward (ms)':>18}")
+    for nout in [2, 8, 32, 128]:
+        layer = Layer(16, nout)
+        t0 = time.perf_counter()
+        jacobian(layer, x)
+        t1 = time.perf_counter()
+        per_output(layer, x)
+        t2 = time.perf_counter()
+        print(f"{nout:>8} {(t1 - t0) * 1e3:>14.2f} {(t2 - t1) * 1e3:>18.2f}")
@@ -0,0 +1,42 @@
+"""
+Full Jacobian of MLP([2,16,16,nout]) at one input: forward mode (one jvp
+per input, so 2 passes) against reverse mode (one backward per output).
+Forward mode wins once there are more outputs than inputs.
+
+    python benchmarks/bench_jvp.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.engine import Value
+from micrograd.nn import MLP
+from micrograd.dual import jvp
+
+def forward_mode(model, x):
+    return [jvp(model, x, [1.0 if j == i else 0.0 for j in range(len(x))])[1] for i in range(len(x))]
+
+def reverse_mode(model, x):
+    rows = []
+    for i in range(len(model.layers[-1].neurons)):
+        inputs = [Value(xi) for xi in x]
+        outs = model(inputs)
+        outs = outs if isinstance(outs, list) else [outs]
+        outs[i].backward()
+        rows.append([v.grad for v in inputs])
+    return rows
+
+if __name__ == '__main__':
+    random.seed(0)
+    x = [0.3, -0.2]
+    print(f"{'outputs':>8} {'forward (ms)':>13} {'reverse (ms)':>13}")
+    for nout in [1, 2, 4, 16, 64]:
+        model = MLP(2, [16, 16, nout])
+        t0 = time.perf_counter()
+        forward_mode(model, x)
+        t1 = time.perf_counter()
+        reverse_mode(model, x)
+        t2 = time.perf_counter()
+        print(f"{nout:>8} {(t1 - t0) * 1e3:>13.2f} {(t2 - t1) * 1e3:>13.2f}")
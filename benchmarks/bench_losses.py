@@ -0,0 +1,42 @@
+"""
+Graph size and time per training step on the demo.ipynb moons setup, with
+the loss built from scalar ops as in the notebook versus the fused
+micrograd.losses.svm_loss node.
+
+    python benchmarks/bench_losses.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.nn import MLP
+from micrograd import losses
+from moons import make_moons, svm_loss
+
+STEPS = 5
+
+def fused_loss(model, X, y, alpha=1e-4):
+    return losses.svm_loss([model(x) for x in X], y, model.parameters(), alpha)
+
+def run(loss_fn, X, y):
+    random.seed(1337)
+    model = MLP(2, [16, 16, 1])
+    nodes = len(loss_fn(model, X, y)._build_topo())
+    t0 = time.perf_counter()
+    for _ in range(STEPS):
+        loss = loss_fn(model, X, y)
+        model.zero_grad()
+        loss.backward()
+        for p in model.parameters():
+            p.data -= 0.1 * p.grad
+    return nodes, (time.perf_counter() - t0) / STEPS
+
+if __name__ == '__main__':
+    X, y = make_moons(100)
+    print(f"{'loss':>10} {'nodes':>8} {'s/step':>8}")
+    for name, fn in [('composed', svm_loss), ('fused', fused_loss)]:
+        nodes, t = run(fn, X, y)
+        print(f"{name:>10} {nodes:>8} {t:>8.3f}")
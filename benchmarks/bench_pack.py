@@ -0,0 +1,46 @@
+"""
+Times the forward, backward and optimizer step of a training step on 100
+moons, with the MLP's parameters as separate Values and packed into a
+ParameterBuffer (see Module.pack).
+
+    python benchmarks/bench_pack.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.nn import MLP
+from micrograd.optim import SGD
+from moons import make_moons, svm_loss
+
+def step_times(model, X, y, steps=10):
+    opt = SGD(model.parameters(), lr=0.1)
+    forward = backward = update = 0.0
+    for _ in range(steps):
+        t0 = time.perf_counter()
+        loss = svm_loss(model, X, y)
+        t1 = time.perf_counter()
+        opt.zero_grad()
+        loss.backward()
+        t2 = time.perf_counter()
+        opt.step()
+        t3 = time.perf_counter()
+        forward, backward, update = forward + t1 - t0, backward + t2 - t1, update + t3 - t2
+    return forward / steps, backward / steps, update / steps
+
+if __name__ == '__main__':
+    X, y = make_moons(n_samples=100, noise=0.1)
+    print(f"{'model':>12} {'params':>8} {'storage':>9} {'forward (ms)':>13} {'backward (ms)':>14} {'step (ms)':>10}")
+    for nouts in ([16, 16, 1], [64, 64, 1]):
+        name = 'x'.join(map(str, [2] + nouts))
+        for packed in (False, True):
+            random.seed(1337)
+            model = MLP(2, nouts)
+            if packed:
+                model.pack()
+            n = len(model.parameters())
+            times = step_times(model, X, y)
+            print(f"{name:>12} {n:>8} {'packed' if packed else 'Values':>9} "
+                  + ' '.join(f"{t * 1e3:>{w}.2f}" for t, w in zip(times, (13, 14, 10))))
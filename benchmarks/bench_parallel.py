@@ -0,0 +1,49 @@
+"""
+Times full-batch training steps on the demo.ipynb moons setup with
+MLP([2,16,16,1]), single process versus DataParallel over 1..N workers.
+
+    python benchmarks/bench_parallel.py [n_samples]
+"""
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.nn import MLP
+from micrograd.parallel import DataParallel
+from moons import make_moons, svm_loss
+
+STEPS = 3
+
+def single(model, X, y):
+    t0 = time.perf_counter()
+    for _ in range(STEPS):
+        model.zero_grad()
+        svm_loss(model, X, y).backward()
+    return (time.perf_counter() - t0) / STEPS
+
+def parallel(model, X, y, processes):
+    with DataParallel(model, svm_loss, processes) as dp:
+        dp.step(X[:processes], y[:processes]) # warm up the pool
+        t0 = time.perf_counter()
+        for _ in range(STEPS):
+            model.zero_grad()
+            dp.step(X, y)
+        return (time.perf_counter() - t0) / STEPS
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    X, y = make_moons(n, noise=0.1)
+    random.seed(1337)
+    model = MLP(2, [16, 16, 1])
+    base = single(model, X, y)
+    print(f"{'processes':>10} {'s/step':>8} {'speedup':>8}")
+    print(f"{'single':>10} {base:>8.3f} {1.0:>7.2f}x")
+    p = 1
+    while p <= multiprocessing.cpu_count():
+        t = parallel(model, X, y, p)
+        print(f"{p:>10} {t:>8.3f} {base / t:>7.2f}x")
+        p *= 2
@@ -0,0 +1,67 @@
+"""
+Node count and backward() time of two graphs before and after
+micrograd.passes.optimize:
+
+- standardize: (x_i - mean(xs)) / std(xs) written the naive way, with the
+  mean and std recomputed for every element
+- gradient penalty: sum of squared gradients of an MLP's loss, from
+  grad(create_graph=True), whose gradient graph repeats many products
+
+    python benchmarks/bench_passes.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.engine import Value, grad, sum as vsum
+from micrograd.nn import MLP
+from micrograd.passes import optimize
+
+def standardize(n):
+    xs = [Value(random.uniform(-1, 1)) for _ in range(n)]
+    def mean():
+        return vsum(xs) / n
+    def std():
+        return (vsum([(x - mean())**2 for x in xs]) / n)**0.5
+    return xs, vsum([((x - mean()) / std())**3 for x in xs])
+
+def gradient_penalty(n):
+    model = MLP(2, [16, 16, 1])
+    X = [[random.uniform(-1, 1), random.uniform(-1, 1)] for _ in range(n)]
+    y = [1 if i % 2 else -1 for i in range(n)]
+    loss = vsum([(1 - yi * model(x)).relu() for x, yi in zip(X, y)]) / n
+    params = model.parameters()
+    return params, vsum([g * g for g in grad(loss, params, create_graph=True)])
+
+def run(build, n):
+    random.seed(0)
+    leaves, out = build(n)
+    nodes = len(out._build_topo())
+    t0 = time.perf_counter()
+    out.backward()
+    t_plain = time.perf_counter() - t0
+    reference = [v.grad for v in leaves]
+
+    random.seed(0)
+    leaves, out = build(n)
+    t0 = time.perf_counter()
+    out = optimize(out)
+    t_opt = time.perf_counter() - t0
+    nodes_opt = len(out._build_topo())
+    t0 = time.perf_counter()
+    out.backward()
+    t_back = time.perf_counter() - t0
+    err = max(abs(v.grad - g) for v, g in zip(leaves, reference))
+    return nodes, nodes_opt, t_plain, t_opt, t_back, err
+
+if __name__ == '__main__':
+    print(f"{'graph':>18} {'n':>4} {'nodes':>7} {'optimized':>10} {'backward (s)':>13} "
+          f"{'optimize (s)':>13} {'opt. backward (s)':>18} {'max |dgrad|':>12}")
+    for name, build, sizes in [('standardize', standardize, (50, 200)),
+                               ('gradient penalty', gradient_penalty, (8, 32))]:
+        for n in sizes:
+            nodes, nodes_opt, t_plain, t_opt, t_back, err = run(build, n)
+            print(f"{name:>18} {n:>4} {nodes:>7} {nodes_opt:>10} {t_plain:>13.4f} "
+                  f"{t_opt:>13.4f} {t_back:>18.4f} {err:>12.1e}")
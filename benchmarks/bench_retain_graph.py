@@ -0,0 +1,47 @@
+"""
+RSS over a long training loop on the moons setup that keeps every step's
+loss Value around (as a loss history would), with backward() releasing the
+graph (the default) versus backward(retain_graph=True). Each setting runs
+in a fresh process.
+
+    python benchmarks/bench_retain_graph.py [steps]
+"""
+import os
+import random
+import resource
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.nn import MLP
+from moons import make_moons, svm_loss
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # KB on Linux
+
+def run(steps, retain):
+    X, y = make_moons(50)
+    random.seed(1337)
+    model = MLP(2, [16, 16, 1])
+    history = []
+    marks = []
+    for k in range(steps):
+        loss = svm_loss(model, X, y)
+        model.zero_grad()
+        loss.backward(retain_graph=retain)
+        for p in model.parameters():
+            p.data -= 0.1 * p.grad
+        history.append(loss)
+        if (k + 1) % max(1, steps // 4) == 0:
+            marks.append(f"{rss_mb():.0f}")
+    print(f"{str(retain):>12} {' '.join(marks):>30}")
+
+if __name__ == '__main__':
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    if len(sys.argv) > 2:
+        run(steps, sys.argv[2] == 'True')
+    else:
+        print(f"{'retain_graph':>12} {'peak RSS MB at 1/4, 1/2, 3/4, end':>30}")
+        for retain in [True, False]:
+            subprocess.run([sys.executable, __file__, str(steps), str(retain)], check=True)
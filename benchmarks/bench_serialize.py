@@ -0,0 +1,75 @@
+"""
+File size, save/load time and load memory of an MLP with
+micrograd.serialize (read and mmap) against pickling the model, and the
+time from loading to the first prediction under no_grad.
+
+    python benchmarks/bench_serialize.py
+"""
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.engine import no_grad
+from micrograd.nn import MLP
+from micrograd.serialize import save, load
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+def load_peak(fn):
+    # peak Python heap while loading; a memory-mapped file's pages don't count
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def first_prediction(fn, x):
+    def serve():
+        model = fn()
+        with no_grad():
+            return model(x)
+    return timed(serve)[1]
+
+if __name__ == '__main__':
+    random.seed(0)
+    tmp = tempfile.mkdtemp()
+    x = [0.5, -1.0]
+    print(f"{'model':>16} {'params':>8} {'format':>8} {'size (KB)':>10} {'save (s)':>9} {'load (s)':>9} "
+          f"{'load peak (KB)':>15} {'load+predict (s)':>17}")
+    for nouts in ([64, 64, 1], [256, 256, 1], [1024, 1024, 1]):
+        model = MLP(2, nouts)
+        n = len(model.parameters())
+        name = 'x'.join(map(str, [2] + nouts))
+        with no_grad():
+            expected = model(x)
+
+        path = os.path.join(tmp, 'model.pkl')
+        def dump():
+            with open(path, 'wb') as f:
+                pickle.dump(model, f)
+        def undump():
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        loaders = [('pickle', dump, undump)]
+        for fmt, mmap in (('read', False), ('mmap', True)):
+            loaders.append((fmt, lambda: save(model, path), lambda mmap=mmap: load(path, mmap=mmap)))
+
+        for fmt, saver, loader in loaders:
+            if fmt != 'mmap': # mmap reads the file that 'read' saved
+                path = os.path.join(tmp, 'model.pkl' if fmt == 'pickle' else 'model.bin')
+                _, t_save = timed(saver)
+            loaded, t_load = timed(loader)
+            with no_grad():
+                assert loaded(x) == expected
+            peak = load_peak(loader)
+            t_serve = first_prediction(loader, x)
+            print(f"{name:>16} {n:>8} {fmt:>8} {os.path.getsize(path) / 1024:>10.1f} {t_save:>9.3f} {t_load:>9.3f} "
+                  f"{peak / 1024:>15.1f} {t_serve:>17.3f}")
@@ -0,0 +1,36 @@
+"""
+Wall time of a 12-config sweep on the moons (layer sizes x alpha x learning
+rate) run one after another in this process, across a process pool, and
+across a process pool with early stopping.
+
+    python benchmarks/bench_sweep.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.sweep import SharedDataset, sweep, train_mlp
+from moons import make_moons
+
+if __name__ == '__main__':
+    X, y = make_moons(n_samples=100, noise=0.1)
+    configs = [{'nouts': nouts, 'alpha': alpha, 'lr': lr, 'steps': 50}
+               for nouts in ([8, 1], [16, 16, 1]) for alpha in (1e-4, 1e-2) for lr in (1.0, 0.3, 0.03)]
+    cpus = os.cpu_count()
+    print(f"{len(configs)} configs, {cpus} cores")
+    print(f"{'mode':>28} {'time (s)':>9} {'steps run':>10} {'best loss':>10}")
+    t0 = time.perf_counter()
+    with SharedDataset(X, y) as data:
+        results = [train_mlp(config, data, lambda metric: True) for config in configs]
+    t = time.perf_counter() - t0
+    print(f"{'one after another':>28} {t:>9.2f} {sum(r['steps'] for r in results):>10} "
+          f"{min(r['loss'] for r in results):>10.4f}")
+    for name, kwargs in [(f'pool of {cpus}', dict(processes=cpus, early_stopping=False)),
+                         (f'pool of {cpus} + early stopping', dict(processes=cpus))]:
+        t0 = time.perf_counter()
+        results = sweep(configs, X, y, **kwargs)
+        t = time.perf_counter() - t0
+        steps = sum(r['steps'] for r in results)
+        best = min(r['loss'] for r in results)
+        print(f"{name:>28} {t:>9.2f} {steps:>10} {best:>10.4f}")
@@ -0,0 +1,35 @@
+"""
+Times one forward + backward pass of the scalar MLP against TensorMLP
+for a batch of inputs, across layer widths.
+
+    python benchmarks/bench_tensor.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.nn import MLP, TensorMLP
+
+def step_scalar(model, X):
+    model.zero_grad()
+    loss = sum(model(list(x)) for x in X)
+    loss.backward()
+
+def step_tensor(model, X):
+    model.zero_grad()
+    loss = model(X).sum()
+    loss.backward()
+
+if __name__ == '__main__':
+    X = np.random.uniform(-1, 1, (32, 2))
+    print(f"{'width':>6} {'MLP (s)':>9} {'TensorMLP (s)':>14} {'speedup':>8}")
+    for width in [4, 16, 64]:
+        t0 = time.perf_counter()
+        step_scalar(MLP(2, [width, width, 1]), X)
+        t1 = time.perf_counter()
+        step_tensor(TensorMLP(2, [width, width, 1]), X)
+        t2 = time.perf_counter()
+        print(f"{width:>6} {t1 - t0:>9.4f} {t2 - t1:>14.4f} {(t1 - t0) / (t2 - t1):>7.0f}x")
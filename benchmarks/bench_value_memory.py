@@ -0,0 +1,106 @@
+"""
+Compares the memory footprint and throughput of the slotted Value against
+the original closure-based implementation (kept below as LegacyValue),
+on an MLP([2,16,16,1]) max-margin loss over a full batch.
+
+    python benchmarks/bench_value_memory.py
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.engine import Value
+
+class LegacyValue:
+    """ the original Value: an instance __dict__, a set of children and a closure per node """
+
+    def __init__(self, data, _children=(), _op=''):
+        self.data = data
+        self.grad = 0
+        self._backward = lambda: None
+        self._prev = set(_children)
+        self._op = _op
+
+    def __add__(self, other):
+        other = other if isinstance(other, LegacyValue) else LegacyValue(other)
+        out = LegacyValue(self.data + other.data, (self, other), '+')
+        def _backward():
+            self.grad += out.grad
+            other.grad += out.grad
+        out._backward = _backward
+        return out
+
+    def __mul__(self, other):
+        other = other if isinstance(other, LegacyValue) else LegacyValue(other)
+        out = LegacyValue(self.data * other.data, (self, other), '*')
+        def _backward():
+            self.grad += other.data * out.grad
+            other.grad += self.data * out.grad
+        out._backward = _backward
+        return out
+
+    def relu(self):
+        out = LegacyValue(0 if self.data < 0 else self.data, (self,), 'ReLU')
+        def _backward():
+            self.grad += (out.data > 0) * out.grad
+        out._backward = _backward
+        return out
+
+    def backward(self):
+        topo = []
+        visited = set()
+        stack = [(self, False)]
+        while stack:
+            v, expanded = stack.pop()
+            if expanded:
+                topo.append(v)
+            elif v not in visited:
+                visited.add(v)
+                stack.append((v, True))
+                stack.extend((c, False) for c in v._prev)
+        self.grad = 1
+        for v in reversed(topo):
+            v._backward()
+
+    def __radd__(self, other):
+        return self + other
+
+    def __rmul__(self, other):
+        return self * other
+
+def mlp_loss(cls, X, y, sizes=(2, 16, 16, 1)):
+    # the same computation as micrograd.nn.MLP + the demo.ipynb loss, for either Value class
+    rng = random.Random(0)
+    layers = [[([cls(rng.uniform(-1, 1)) for _ in range(nin)], cls(0)) for _ in range(nout)]
+              for nin, nout in zip(sizes, sizes[1:])]
+    losses = []
+    for xi, yi in zip(X, y):
+        x = xi
+        for i, layer in enumerate(layers):
+            x = [sum((wi*xj for wi, xj in zip(w, x)), b) for w, b in layer]
+            if i != len(layers) - 1:
+                x = [a.relu() for a in x]
+        losses.append((1 + -yi*x[0]).relu())
+    return sum(losses) * (1.0 / len(losses))
+
+def peak_memory(cls, X, y):
+    tracemalloc.start()
+    loss = mlp_loss(cls, X, y)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+if __name__ == '__main__':
+    rng = random.Random(1)
+    X = [[rng.uniform(-2, 2), rng.uniform(-2, 2)] for _ in range(100)]
+    y = [rng.choice([-1.0, 1.0]) for _ in range(100)]
+    print(f"{'':>12} {'peak MB':>9} {'forward (s)':>12} {'backward (s)':>13}")
+    for name, cls in [('legacy', LegacyValue), ('slotted', Value)]:
+        peak = peak_memory(cls, X, y)
+        # timed separately, tracemalloc slows allocation down
+        t0 = time.perf_counter(); loss = mlp_loss(cls, X, y); t1 = time.perf_counter()
+        loss.backward(); t2 = time.perf_counter()
+        print(f"{name:>12} {peak / 2**20:>9.1f} {t1 - t0:>12.3f} {t2 - t1:>13.3f}")
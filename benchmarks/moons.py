@@ -0,0 +1,23 @@
+"""
+The moons setup from demo.ipynb, without the sklearn dependency: a
+make_moons equivalent and the svm max-margin loss with L2 regularization.
+"""
+import math
+import random
+
+def make_moons(n_samples=100, noise=0.1, seed=1337):
+    rng = random.Random(seed)
+    n_out = n_samples // 2
+    n_in = n_samples - n_out
+    X = [[math.cos(t), math.sin(t)] for t in (math.pi * i / (n_out - 1) for i in range(n_out))]
+    X += [[1 - math.cos(t), 1 - math.sin(t) - 0.5] for t in (math.pi * i / (n_in - 1) for i in range(n_in))]
+    X = [[a + rng.gauss(0, noise), b + rng.gauss(0, noise)] for a, b in X]
+    y = [-1.0] * n_out + [1.0] * n_in
+    return X, y
+
+def svm_loss(model, X, y, alpha=1e-4):
+    scores = [model(x) for x in X]
+    losses = [(1 + -yi*scorei).relu() for yi, scorei in zip(y, scores)]
+    data_loss = sum(losses) * (1.0 / len(losses))
+    reg_loss = alpha * sum((p*p for p in model.parameters()))
+    return data_loss + reg_loss
@@ -0,0 +1,175 @@
+"""
+Benchmark suite for the engine and nn hot paths, with machine-readable output.
+
+Each case is timed --repeat times with the garbage collector off, and the
+best and median wall time are reported. Its setup (e.g. building the graph
+that backward() then consumes) is kept out of the timing. Results go to stdout as a table and, with --json, to a
+file that a later run can be checked against with --compare:
+
+    python benchmarks/run.py --json before.json
+    python benchmarks/run.py --compare before.json --threshold 1.2
+
+--compare exits with status 1 if any case's best time got slower than
+threshold times its baseline best time (the best of several runs is much
+less noisy than the median). -k only runs the cases whose name contains the string.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from micrograd.engine import Value, sum as vsum
+from micrograd.nn import MLP
+from moons import make_moons, svm_loss
+
+CASES = [] # (name, params, setup, run): run(setup()) is what gets timed
+
+def case(name, setup=lambda: None, **params):
+    def register(run):
+        CASES.append((name, params, setup, run))
+        return run
+    return register
+
+# Value op construction: a mix of the binary and unary ops, 11 nodes per iteration
+
+def _construct():
+    a, b = Value(1.5), Value(-0.5)
+    for _ in range(1000):
+        c = a * b + a
+        d = (c - b) / a
+        e = (d**2).relu() + (-c).tanh() + d.exp()
+
+case('ops/construct', nodes=11000)(lambda _: _construct())
+
+# backward() on a chain of depth n and on a single node of fan-in n
+
+def _chain(n):
+    x = y = Value(1.0)
+    for _ in range(n):
+        y = y * 1.0 + x
+    return y
+
+def _wide(n):
+    xs = [Value(i / n) for i in range(n)]
+    return vsum([x * x for x in xs])
+
+for n in (100, 1000, 10000):
+    case(f'backward/depth={n}', lambda n=n: _chain(n), depth=n)(lambda y: y.backward())
+    case(f'backward/width={n}', lambda n=n: _wide(n), width=n)(lambda y: y.backward())
+
+# MLP forward and forward + backward over a batch of 16 samples
+
+def _mlp(nin, nouts):
+    random.seed(0)
+    model = MLP(nin, nouts)
+    X = [[random.uniform(-1, 1) for _ in range(nin)] for _ in range(16)]
+    return model, X
+
+def _mlp_forward(state):
+    model, X = state
+    return vsum([model(x) for x in X])
+
+for nouts in ([16, 16, 1], [64, 64, 1], [128, 128, 1]):
+    size = 'x'.join(map(str, [2] + nouts))
+    case(f'mlp/forward/{size}', lambda nouts=nouts: _mlp(2, nouts), sizes=[2] + nouts, batch=16)(_mlp_forward)
+    case(f'mlp/backward/{size}', lambda nouts=nouts: _mlp_forward(_mlp(2, nouts)),
+         sizes=[2] + nouts, batch=16)(lambda loss: loss.backward())
+
+# parameters() and zero_grad() on a 4.4k parameter MLP
+
+_model = lambda: MLP(2, [64, 64, 1])
+case('nn/parameters', _model, sizes=[2, 64, 64, 1])(lambda model: model.parameters())
+case('nn/zero_grad', _model, sizes=[2, 64, 64, 1])(lambda model: model.zero_grad())
+
+# one training step of demo.ipynb: loss on all 100 moons, backward, SGD update
+
+def _moons():
+    random.seed(1337)
+    return MLP(2, [16, 16, 1]), make_moons(n_samples=100, noise=0.1)
+
+def _moons_step(state):
+    model, (X, y) = state
+    loss = svm_loss(model, X, y)
+    model.zero_grad()
+    loss.backward()
+    for p in model.parameters():
+        p.data -= 0.9 * p.grad
+
+case('moons/step', _moons, samples=100, sizes=[2, 16, 16, 1])(_moons_step)
+
+def run_case(setup, run, repeat):
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        # like timeit, keep the cyclic garbage collector out of the measurement
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            run(state)
+            times.append(time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return min(times), statistics.median(times)
+
+def _revision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-k', default='', help='only run cases whose name contains this')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='results file of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    slower = []
+    print(f"{'case':>28} {'best (ms)':>10} {'median (ms)':>12} {'vs baseline':>12}")
+    for name, params, setup, run in CASES:
+        if args.k not in name:
+            continue
+        best, median = run_case(setup, run, args.repeat)
+        results[name] = {'params': params, 'best_s': best, 'median_s': median, 'repeat': args.repeat}
+        ratio = ''
+        if name in baseline:
+            r = best / baseline[name]['best_s']
+            ratio = f'{r:.2f}x'
+            if r > args.threshold:
+                slower.append(name)
+        print(f"{name:>28} {best * 1e3:>10.3f} {median * 1e3:>12.3f} {ratio:>12}")
+
+    if args.json:
+        report = {
+            'revision': _revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if slower:
+        print(f"slower than {args.threshold}x baseline: {', '.join(slower)}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
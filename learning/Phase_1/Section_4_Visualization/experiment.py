@@ -63,7 +63,7 @@ print(f"e = d.relu() = {e.data}")
 draw_simple_graph(e, "before_backward")
 
 print("\nStep 2: Compute gradients")
-e.backward()
+e.backward(retain_graph=True)  # keep the graph so we can draw it again below
 
 print(f"After backward pass:")
 print(f"a.grad = {a.grad}")
@@ -21,13 +21,13 @@ def relu(x):
 
 def sigmoid(x):
     """Sigmoid: 1 / (1 + e^(-x))"""
-    return Value(1.0) / (Value(1.0) + (-x).exp())
+    # a single node in the graph, with gradient sigmoid(x) * (1 - sigmoid(x))
+    return x.sigmoid()
 
 def tanh(x):
     """Tanh: (e^x - e^(-x)) / (e^x + e^(-x))"""
-    ex = x.exp()
-    e_neg_x = (-x).exp()
-    return (ex - e_neg_x) / (ex + e_neg_x)
+    # a single node in the graph, with gradient 1 - tanh(x)^2
+    return x.tanh()
 
 def test_activation_shapes():
     """Test how different activations transform inputs"""
@@ -0,0 +1,122 @@
+import math
+from micrograd.engine import Value, _sigmoid, _softmax
+
+def _tuple(c):
+    # source for a tuple of the data of nodes c
+    return '(' + ''.join(f'v{i}, ' for i in c) + ')'
+
+# Code templates per op. Each gets the output node's index, the children's
+# indices and the op's _arg; node i keeps its data in v<i> and its gradient
+# in g<i>. They mirror the rules in engine.py operation for operation, so
+# the compiled function rounds exactly like Value.backward(). The n-ary ops
+# accumulate one statement per term: a single expression of thousands of
+# terms would hit the parser's recursion limit.
+
+def _accumulate(o, first, terms):
+    # v<o> = first, then v<o> += term for each term, like the engine's total +=
+    return [f'v{o} = {first}'] + [f'v{o} += {t}' for t in terms]
+
+_FORWARD_CODE = {
+    '+': lambda o, c, arg: _accumulate(o, f'v{c[0]}', [f'v{i}' for i in c[1:]]),
+    '*': lambda o, c, arg: [f'v{o} = v{c[0]} * v{c[1]}'],
+    '**': lambda o, c, arg: [f'v{o} = v{c[0]}**{arg!r}'],
+    'neg': lambda o, c, arg: [f'v{o} = -v{c[0]}'],
+    '-': lambda o, c, arg: [f'v{o} = v{c[0]} - v{c[1]}'],
+    '/': lambda o, c, arg: [f'v{o} = v{c[0]} / v{c[1]}'],
+    'ReLU': lambda o, c, arg: [f'v{o} = (0 if v{c[0]} < 0 else v{c[0]})'],
+    'dot': lambda o, c, arg: _accumulate(o, '0', [f'v{w} * v{x}' for w, x in zip(c[:len(c)//2], c[len(c)//2:])]),
+    'exp': lambda o, c, arg: [f'v{o} = math.exp(v{c[0]})'],
+    'log': lambda o, c, arg: [f'v{o} = math.log(v{c[0]})'],
+    'tanh': lambda o, c, arg: [f'v{o} = math.tanh(v{c[0]})'],
+    'sigmoid': lambda o, c, arg: [f'v{o} = _sigmoid(v{c[0]})'],
+    'logsumexp': lambda o, c, arg: [f'v{o} = _softmax({_tuple(c)})[1]'],
+    'softmax': lambda o, c, arg: [f'v{o} = _softmax({_tuple(c)})[0][{arg[0]}]'],
+}
+
+_BACKWARD_CODE = {
+    '+': lambda o, c, arg: [f'g{i} += g{o}' for i in c],
+    '*': lambda o, c, arg: [f'g{c[0]} += v{c[1]} * g{o}', f'g{c[1]} += v{c[0]} * g{o}'],
+    '**': lambda o, c, arg: [f'g{c[0]} += ({arg!r} * v{c[0]}**({arg!r}-1)) * g{o}'],
+    'neg': lambda o, c, arg: [f'g{c[0]} += -g{o}'],
+    '-': lambda o, c, arg: [f'g{c[0]} += g{o}', f'g{c[1]} -= g{o}'],
+    '/': lambda o, c, arg: [f'g{c[0]} += (1 / v{c[1]}) * g{o}', f'g{c[1]} += (-v{c[0]} / v{c[1]}**2) * g{o}'],
+    'ReLU': lambda o, c, arg: [f'g{c[0]} += (v{o} > 0) * g{o}'],
+    'dot': lambda o, c, arg: [line for w, x in zip(c[:len(c)//2], c[len(c)//2:])
+                              for line in (f'g{w} += v{x} * g{o}', f'g{x} += v{w} * g{o}')],
+    'exp': lambda o, c, arg: [f'g{c[0]} += v{o} * g{o}'],
+    'log': lambda o, c, arg: [f'g{c[0]} += (1 / v{c[0]}) * g{o}'],
+    'tanh': lambda o, c, arg: [f'g{c[0]} += (1 - v{o}**2) * g{o}'],
+    'sigmoid': lambda o, c, arg: [f'g{c[0]} += (v{o} * (1 - v{o})) * g{o}'],
+    # the softmax probabilities are recomputed rather than kept around from the forward pass
+    'logsumexp': lambda o, c, arg: [f'p{o} = _softmax({_tuple(c)})[0]'] +
+                                   [f'g{x} += p{o}[{j}] * g{o}' for j, x in enumerate(c)],
+    'softmax': lambda o, c, arg: [f'p{o} = _softmax({_tuple(c)})[0]'] +
+                                 [f'g{x} += (p{o}[{arg[0]}] * ({j == arg[0]} - p{o}[{j}])) * g{o}' for j, x in enumerate(c)],
+}
+
+class CompiledFunction:
+    """
+    A function of scalar inputs, traced once through Value ops and turned
+    into straight-line Python source for its forward and backward pass.
+
+    Calling it with numbers returns (output, [d output / d input, ...]).
+    Leaves that are not inputs (e.g. model parameters captured by fn) are
+    read live on every call, and their .grad is accumulated exactly like
+    Value.backward() would. The trace only records the ops that ran for the
+    first call's inputs, so fn must not branch on .data.
+    """
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.nargs = None
+        self.source = None
+        self._compiled = None
+
+    def _trace(self, args):
+        inputs = [Value(a) for a in args]
+        out = self.fn(*inputs)
+        topo = out._build_topo()
+        index = {v: i for i, v in enumerate(topo)}
+        arg_index = {v: i for i, v in enumerate(inputs)}
+        leaves = [] # non-input leaves, passed in as L
+
+        fwd, bwd = [], []
+        for i, v in enumerate(topo):
+            if v in arg_index:
+                fwd.append(f'v{i} = x{arg_index[v]}')
+            elif not v._prev:
+                fwd.append(f'v{i} = L[{len(leaves)}].data')
+                bwd.append(f'g{i} = L[{len(leaves)}].grad')
+                leaves.append(v)
+            elif v._op in _FORWARD_CODE:
+                fwd += _FORWARD_CODE[v._op](i, [index[c] for c in v._prev], v._arg)
+            else:
+                raise NotImplementedError(f"compile does not support op '{v._op}'")
+        # every interior node and input starts at zero, like in a freshly built graph
+        bwd += [f'g{i} = 0' for i, v in enumerate(topo) if (v._prev or v in arg_index) and v is not out]
+        bwd.append(f'g{index[out]} = 1')
+        for i in reversed(range(len(topo))):
+            v = topo[i]
+            if v._prev:
+                bwd += _BACKWARD_CODE[v._op](i, [index[c] for c in v._prev], v._arg)
+        bwd += [f'L[{j}].grad = g{index[v]}' for j, v in enumerate(leaves)]
+
+        params = ', '.join([f'x{i}' for i in range(len(inputs))] + ['L'])
+        grads = ', '.join(f'g{index[v]}' if v in index else '0' for v in inputs)
+        self.source = '\n'.join([f'def _compiled({params}):'] +
+                                ['    ' + line for line in fwd + bwd] +
+                                [f'    return v{index[out]}, [{grads}]'])
+        namespace = {'math': math, '_sigmoid': _sigmoid, '_softmax': _softmax}
+        exec(self.source, namespace)
+        self._compiled = namespace['_compiled']
+        self._leaves = leaves
+        self.nargs = len(inputs)
+
+    def __call__(self, *args):
+        if self._compiled is None or len(args) != self.nargs:
+            self._trace(args)
+        return self._compiled(*args, self._leaves)
+
+def compile(fn):
+    """ returns fn compiled into straight-line forward + backward code, see CompiledFunction """
+    return CompiledFunction(fn)
@@ -0,0 +1,227 @@
+import ast
+import csv
+import queue
+import random
+import struct
+import sys
+import threading
+from array import array
+
+# Streaming input pipeline: a source yields (x, y) samples one at a time from
+# disk, shuffle() and batch() turn them into minibatches, and prefetch() builds
+# the next minibatches in a background thread while the model trains on the
+# current one. Only the shuffle buffer and the prefetched batches are in memory.
+# A DataLoader strings them together, one pass over the source per epoch.
+
+class CSVSource:
+    """
+    Samples from a CSV file of numbers, one row each: the target is column
+    target and x is the other columns as floats. header=True skips the first row.
+    """
+
+    def __init__(self, path, target=-1, header=False, delimiter=','):
+        self.path = path
+        self.target = target
+        self.header = header
+        self.delimiter = delimiter
+
+    def __iter__(self):
+        with open(self.path, newline='') as f:
+            rows = csv.reader(f, delimiter=self.delimiter)
+            if self.header:
+                next(rows, None)
+            for row in rows:
+                if not row:
+                    continue
+                values = [float(v) for v in row]
+                y = values.pop(self.target)
+                yield values, y
+
+# .npy dtypes (without the byte order character) and the matching array typecodes
+_NPY_TYPES = {'f8': 'd', 'f4': 'f', 'i8': 'q', 'i4': 'i', 'i2': 'h', 'i1': 'b', 'u8': 'Q', 'u4': 'I',
+              'u2': 'H', 'u1': 'B', 'b1': 'B'}
+
+def _read_npy_header(f):
+    # https://numpy.org/doc/stable/reference/generated/numpy.lib.format.html
+    if f.read(6) != b'\x93NUMPY':
+        raise ValueError(f"{f.name} is not a .npy file")
+    major, _ = f.read(2)
+    size = '<H' if major == 1 else '<I'
+    n, = struct.unpack(size, f.read(struct.calcsize(size)))
+    header = ast.literal_eval(f.read(n).decode('latin1'))
+    if header['fortran_order']:
+        raise ValueError(f"{f.name}: Fortran-ordered arrays are not supported")
+    order, kind = header['descr'][0], header['descr'][1:]
+    if kind not in _NPY_TYPES:
+        raise ValueError(f"{f.name}: unsupported dtype {header['descr']}")
+    swap = order == ('>' if sys.byteorder == 'little' else '<')
+    return header['shape'], _NPY_TYPES[kind], swap
+
+def _npy_rows(path, chunk):
+    # the rows of a .npy array, read chunk rows at a time; rows of a >2-D array come flattened
+    with open(path, 'rb') as f:
+        shape, typecode, swap = _read_npy_header(f)
+        width = 1
+        for n in shape[1:]:
+            width *= n
+        remaining = shape[0] if shape else 1
+        while remaining:
+            k = min(chunk, remaining)
+            block = array(typecode)
+            block.fromfile(f, k * width)
+            if swap:
+                block.byteswap()
+            values = block.tolist()
+            if len(shape) < 2:
+                yield from values
+            else:
+                for i in range(0, len(values), width):
+                    yield values[i:i + width]
+            remaining -= k
+
+class NPYSource:
+    """
+    Samples from .npy files, parsed with the standard library and read in
+    chunks of chunk rows: x is a row of the array at x_path (a number for
+    1-D arrays), y the matching entry of the array at y_path, or None.
+    """
+
+    def __init__(self, x_path, y_path=None, chunk=1024):
+        self.x_path = x_path
+        self.y_path = y_path
+        self.chunk = chunk
+
+    def __iter__(self):
+        xs = _npy_rows(self.x_path, self.chunk)
+        if self.y_path is None:
+            return ((x, None) for x in xs)
+        return zip(xs, _npy_rows(self.y_path, self.chunk))
+
+def shuffle(items, buffer_size, rng=random):
+    """
+    Shuffles a stream with a buffer of buffer_size items: each item out is
+    drawn at random from the buffer and replaced by the next one in. The
+    bigger the buffer, the closer to a full shuffle.
+    """
+    buffer = []
+    for item in items:
+        if len(buffer) < buffer_size:
+            buffer.append(item)
+            continue
+        i = rng.randrange(buffer_size)
+        yield buffer[i]
+        buffer[i] = item
+    rng.shuffle(buffer)
+    yield from buffer
+
+def batch(items, batch_size, drop_last=False):
+    """ groups (x, y) samples into (X, y) minibatches of lists, the last one maybe smaller """
+    X, y = [], []
+    for xi, yi in items:
+        X.append(xi)
+        y.append(yi)
+        if len(X) == batch_size:
+            yield X, y
+            X, y = [], []
+    if X and not drop_last:
+        yield X, y
+
+_ITEM, _DONE, _ERROR = range(3)
+
+class prefetch:
+    """
+    Iterates over iterable in a background thread, keeping up to depth
+    items ready. Reading and parsing the next items then overlaps with
+    whatever the consumer does between them (file reads release the GIL).
+    An exception in the thread is raised in the consumer. close() stops the
+    thread early, e.g. when the consumer breaks out of the loop.
+    """
+
+    def __init__(self, iterable, depth=2):
+        self._queue = queue.Queue(depth)
+        self._stop = threading.Event()
+        self._done = False
+        self._thread = threading.Thread(target=self._run, args=(iterable,), daemon=True)
+        self._thread.start()
+
+    def _run(self, iterable):
+        try:
+            for item in iterable:
+                if not self._put((_ITEM, item)):
+                    return
+            self._put((_DONE, None))
+        except BaseException as e:
+            self._put((_ERROR, e))
+
+    def _put(self, message):
+        # a blocking put that gives up once close() is called
+        while not self._stop.is_set():
+            try:
+                self._queue.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._done:
+            raise StopIteration
+        kind, item = self._queue.get()
+        if kind == _ITEM:
+            return item
+        self._done = True
+        self._thread.join()
+        if kind == _ERROR:
+            raise item
+        raise StopIteration
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        # drop whatever was prefetched, so later next() calls stop instead of waiting on the queue
+        self._done = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class DataLoader:
+    """
+    Minibatches from a source of (x, y) samples: a CSVSource, an NPYSource or
+    anything else that can be iterated over more than once, like a list of
+    pairs. Every iteration is one epoch over the source, shuffled with a
+    buffer of shuffle_buffer samples (0 to keep the order) and with
+    prefetch minibatches built ahead in a background thread (0 for none).
+    """
+
+    def __init__(self, source, batch_size, shuffle_buffer=0, prefetch=2, drop_last=False, seed=None):
+        self.source = source
+        self.batch_size = batch_size
+        self.shuffle_buffer = shuffle_buffer
+        self.prefetch = prefetch
+        self.drop_last = drop_last
+        self.seed = seed
+        self.epoch = 0
+
+    def __iter__(self):
+        # a different but reproducible order every epoch when seeded
+        rng = random.Random(None if self.seed is None else self.seed + self.epoch)
+        self.epoch += 1
+        items = iter(self.source)
+        if self.shuffle_buffer:
+            items = shuffle(items, self.shuffle_buffer, rng)
+        batches = batch(items, self.batch_size, self.drop_last)
+        if not self.prefetch:
+            return batches
+        return self._prefetched(batches)
+
+    def _prefetched(self, batches):
+        with prefetch(batches, self.prefetch) as batches:
+            yield from batches
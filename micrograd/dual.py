@@ -0,0 +1,101 @@
+import math
+from micrograd.engine import no_grad, _sigmoid
+
+class Dual:
+    """
+    A dual number data + tangent*eps with eps**2 = 0, for forward-mode autodiff.
+    Every op carries the tangent along with the value, so one forward pass
+    gives the directional derivative of the result, with no graph and no
+    backward pass. Supports the same ops as Value, and the n-ary ones in
+    micrograd.engine (sum, dot, logsumexp, softmax) accept Duals too.
+    """
+
+    __slots__ = ('data', 'tangent')
+
+    def __init__(self, data, tangent=0.0):
+        self.data = data
+        self.tangent = tangent
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.data + other.data, self.tangent + other.tangent)
+        return Dual(self.data + other, self.tangent)
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.data * other.data, self.tangent * other.data + self.data * other.tangent)
+        return Dual(self.data * other, self.tangent * other)
+
+    def __pow__(self, other):
+        assert isinstance(other, (int, float)), "only supporting int/float powers for now"
+        return Dual(self.data**other, other * self.data**(other-1) * self.tangent)
+
+    def relu(self):
+        return Dual(0, 0.0) if self.data < 0 else Dual(self.data, (self.data > 0) * self.tangent)
+
+    def exp(self):
+        e = math.exp(self.data)
+        return Dual(e, e * self.tangent)
+
+    def log(self):
+        return Dual(math.log(self.data), self.tangent / self.data)
+
+    def tanh(self):
+        t = math.tanh(self.data)
+        return Dual(t, (1 - t**2) * self.tangent)
+
+    def sigmoid(self):
+        s = _sigmoid(self.data)
+        return Dual(s, s * (1 - s) * self.tangent)
+
+    def __neg__(self): # -self
+        return self * -1
+
+    def __radd__(self, other): # other + self
+        return self + other
+
+    def __sub__(self, other): # self - other
+        return self + (-other)
+
+    def __rsub__(self, other): # other - self
+        return other + (-self)
+
+    def __rmul__(self, other): # other * self
+        return self * other
+
+    def __truediv__(self, other): # self / other
+        return self * other**-1
+
+    def __rtruediv__(self, other): # other / self
+        return other * self**-1
+
+    # comparisons look at the value only, e.g. for a relu written as 0 if x < 0 else x
+    def __lt__(self, other):
+        return self.data < (other.data if isinstance(other, Dual) else other)
+
+    def __gt__(self, other):
+        return self.data > (other.data if isinstance(other, Dual) else other)
+
+    def __repr__(self):
+        return f"Dual(data={self.data}, tangent={self.tangent})"
+
+def jvp(fn, primals, tangents):
+    """
+    Evaluates fn(xs) at xs = primals and returns (outputs, J @ tangents),
+    where J is the Jacobian of fn. fn takes a list of numbers and returns one
+    number or a list; it runs under no_grad, so micrograd.nn modules work
+    as-is. One call per tangent direction: for n inputs, n calls give the
+    full Jacobian regardless of the number of outputs.
+    """
+    with no_grad():
+        out = fn([Dual(p, t) for p, t in zip(primals, tangents)])
+    outs = out if isinstance(out, (list, tuple)) else [out]
+    for o in outs:
+        # e.g. a Value made by mixing Duals with Values, which would silently lose the tangent
+        if not isinstance(o, (Dual, int, float)):
+            raise TypeError(f"jvp: fn must return numbers or Duals, got {type(o).__name__}")
+    values = [o.data if isinstance(o, Dual) else o for o in outs]
+    jv = [o.tangent if isinstance(o, Dual) else 0.0 for o in outs]
+    if isinstance(out, (list, tuple)):
+        return values, jv
+    return values[0], jv[0]
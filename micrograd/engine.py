@@ -1,3 +1,26 @@
+import math
+
+# when False, ops compute their result without recording the graph, see no_grad
+_grad_enabled = True
+
+def is_grad_enabled():
+    return _grad_enabled
+
+class no_grad:
+    """
+    Context manager for inference: inside it, Value ops produce leaf Values
+    with no children, so nothing is kept around for a backward pass, and
+    micrograd.nn modules compute on plain floats.
+    """
+
+    def __enter__(self):
+        global _grad_enabled
+        self.prev = _grad_enabled
+        _grad_enabled = False
+
+    def __exit__(self, *exc):
+        global _grad_enabled
+        _grad_enabled = self.prev
 
 class Value:
     """ 
@@ -6,7 +29,11 @@ class Value:
     creates a new Value that remembers how it was made.
     """
 
-    def __init__(self, data, _children=(), _op=''):
+    # Fixed attribute layout instead of a per-instance __dict__. A graph holds
+    # one Value per scalar, so keeping each one small matters
+    __slots__ = ('data', 'grad', '_prev', '_op', '_arg')
+
+    def __init__(self, data, _children=(), _op='', _arg=None):
         # The actual numeric value (e.g., 2.5, -1.0, etc.)
         self.data = data
         
@@ -14,108 +41,658 @@ class Value:
         # Starts at 0, gets filled in during backward pass
         self.grad = 0
         
-        # Function that knows how to compute gradients for this specific operation
-        # Gets overwritten by each math operation (__add__, __mul__, etc.)
-        self._backward = lambda: None
-        
-        # Set of Value objects that were used to create this one
+        # Tuple of Value objects that were used to create this one
         # Forms the computational graph - these are our "parents"
-        self._prev = set(_children)
+        # Under no_grad the result is a plain leaf instead
+        if _children and not _grad_enabled:
+            _children, _op, _arg = (), '', None
+        self._prev = tuple(_children)
         
-        # String describing what operation created this Value (for debugging/visualization)
+        # String describing what operation created this Value
+        # Used to look up its gradient rule in _BACKWARD (and for debugging/visualization)
         self._op = _op
 
+        # Any non-Value argument the operation needs, e.g. the exponent of **
+        self._arg = _arg
+
     def __add__(self, other):
         # Convert regular numbers to Value objects so we can track gradients
-        other = other if isinstance(other, Value) else Value(other)
+        other = _lift(other)
         
         # Create new Value with the sum, remembering who the parents are
-        out = Value(self.data + other.data, (self, other), '+')
-
-        # Define how gradients flow backward through addition
-        # Key insight: gradient of addition just passes through unchanged to both inputs
-        # If output needs to increase by X, both inputs should increase by X
-        def _backward():
-            self.grad += out.grad    # Add (don't overwrite!) the gradient
-            other.grad += out.grad   # Both inputs get the same gradient
-        out._backward = _backward
-
-        return out
+        # How gradients flow back through it is defined once for all '+' nodes in _add_backward
+        return Value(self.data + other.data, (self, other), '+')
 
     def __mul__(self, other):
         # Convert regular numbers to Value objects
-        other = other if isinstance(other, Value) else Value(other)
+        other = _lift(other)
         
         # Create new Value with the product
-        out = Value(self.data * other.data, (self, other), '*')
-
-        # Define how gradients flow backward through multiplication
-        # Key insight: gradient of multiplication uses the "other" input's value
-        # If f = a * b, then df/da = b and df/db = a (basic calculus!)
-        def _backward():
-            self.grad += other.data * out.grad   # My gradient = other's value * output gradient
-            other.grad += self.data * out.grad   # Other's gradient = my value * output gradient
-        out._backward = _backward
-
-        return out
+        return Value(self.data * other.data, (self, other), '*')
 
     def __pow__(self, other):
         assert isinstance(other, (int, float)), "only supporting int/float powers for now"
-        out = Value(self.data**other, (self,), f'**{other}')
+        return Value(self.data**other, (self,), '**', other)
+
+    def relu(self):
+        return Value(0 if self.data < 0 else self.data, (self,), 'ReLU')
 
-        def _backward():
-            self.grad += (other * self.data**(other-1)) * out.grad
-        out._backward = _backward
+    def exp(self):
+        return Value(math.exp(self.data), (self,), 'exp')
 
-        return out
+    def log(self):
+        return Value(math.log(self.data), (self,), 'log')
 
-    def relu(self):
-        out = Value(0 if self.data < 0 else self.data, (self,), 'ReLU')
+    def tanh(self):
+        return Value(math.tanh(self.data), (self,), 'tanh')
 
-        def _backward():
-            self.grad += (out.data > 0) * out.grad
-        out._backward = _backward
+    def sigmoid(self):
+        return Value(_sigmoid(self.data), (self,), 'sigmoid')
 
-        return out
+    def _backward(self):
+        # apply this node's gradient rule, pushing self.grad into its children
+        rule = _BACKWARD.get(self._op)
+        if rule is not None:
+            rule(self)
 
-    def backward(self):
+    def _forward(self):
+        # recompute self.data from the children's current data (see Plan)
+        rule = _FORWARD.get(self._op)
+        if rule is not None:
+            rule(self)
 
+    def _build_topo(self):
         # topological order all of the children in the graph
+        # uses an explicit stack instead of recursion, so arbitrarily deep graphs
+        # (e.g. a long chain of adds) don't hit Python's recursion limit.
+        # The order only depends on the order of each node's _prev (never on ids or
+        # hashes), so backward() accumulates gradients in the same order every run
         topo = []
         visited = set()
-        def build_topo(v):
-            if v not in visited:
-                visited.add(v)
-                for child in v._prev:
-                    build_topo(child)
+        stack = [(self, False)]
+        while stack:
+            v, expanded = stack.pop()
+            if expanded:
+                # all of v's children are already in topo
                 topo.append(v)
-        build_topo(self)
+            elif v not in visited:
+                visited.add(v)
+                stack.append((v, True))
+                # pushed in reverse so they are popped first to last, like the recursive version
+                for child in reversed(v._prev):
+                    if child not in visited:
+                        stack.append((child, False))
+        return topo
+
+    def backward(self, retain_graph=False, create_graph=False):
+
+        if create_graph:
+            # check the whole graph first, so that an unsupported one leaves every .grad as it was
+            for v in self._build_topo():
+                if v._op in ('checkpoint', 'checkpoint_out'):
+                    raise NotImplementedError("create_graph=True does not support checkpoint() segments")
+            # gradients become Values with their own graph, so they can be differentiated
+            # again; the forward graph has to stay around since they point into it
+            for v, g in _grad_graph(self).items():
+                v.grad = v.grad + g if not v._prev else g
+            return
+
+        topo = self._build_topo()
+
+        # interior nodes start from zero, so that a retained graph can be backpropagated
+        # through again; leaves keep accumulating until zero_grad
+        for v in topo:
+            if v._prev:
+                v.grad = 0
 
         # go one variable at a time and apply the chain rule to get its gradient
         self.grad = 1
-        for v in reversed(topo):
+        if retain_graph:
+            for v in reversed(topo):
+                v._backward()
+            return
+
+        # once a node has pushed its gradient into its children it is not needed
+        # anymore: cut its edges so the graph is freed as we go rather than
+        # staying reachable for as long as the output Value is alive. The node is
+        # marked as freed, so that backpropagating into it again raises instead
+        # of silently treating it as a leaf
+        while topo:
+            v = topo.pop()
             v._backward()
+            if v._prev:
+                v._prev, v._op, v._arg = (), _FREED, None
+
+    # -, unary - and / are nodes of their own rather than compositions of + * and **,
+    # so a - b is one node instead of three (a + (b * -1), with -1 a fresh leaf)
 
     def __neg__(self): # -self
-        return self * -1
+        return Value(-self.data, (self,), 'neg')
 
     def __radd__(self, other): # other + self
         return self + other
 
     def __sub__(self, other): # self - other
-        return self + (-other)
+        other = _lift(other)
+        return Value(self.data - other.data, (self, other), '-')
 
     def __rsub__(self, other): # other - self
-        return other + (-self)
+        return _lift(other) - self
 
     def __rmul__(self, other): # other * self
         return self * other
 
     def __truediv__(self, other): # self / other
-        return self * other**-1
+        other = _lift(other)
+        return Value(self.data / other.data, (self, other), '/')
 
     def __rtruediv__(self, other): # other / self
-        return other * self**-1
+        return _lift(other) / self
 
     def __repr__(self):
         return f"Value(data={self.data}, grad={self.grad})"
+
+class _Constant(Value):
+    # a leaf made from a plain Python number by an op, e.g. the 2 in x * 2.
+    # Unlike other leaves it can never change, see micrograd.passes.optimize
+    __slots__ = ()
+
+def _lift(x):
+    return x if isinstance(x, Value) else _Constant(x)
+
+# n-ary ops: a single node for a whole sum or dot product, instead of a chain of
+# binary nodes that is as deep as the input is long
+
+def _foreign(values):
+    # whether any of values is neither a Value nor a plain number, e.g. a micrograd.dual.Dual:
+    # the ops below then compute with the values' own arithmetic instead of building a node
+    return any(not isinstance(v, (Value, int, float)) for v in values)
+
+def _apply(f, x):
+    # math.f(x) for a plain number, x.f() otherwise
+    return getattr(math, f)(x) if isinstance(x, (int, float)) else getattr(x, f)()
+
+def sum(values):
+    """ values[0] + values[1] + ... as a single '+' node """
+    values = list(values)
+    if values and _foreign(values):
+        total = values[0]
+        for v in values[1:]:
+            total = total + v
+        return total
+    values = [_lift(v) for v in values]
+    if not values:
+        return Value(0)
+    total = values[0].data
+    for v in values[1:]:
+        total += v.data
+    return Value(total, values, '+')
+
+def dot(ws, xs):
+    """ sum of ws[i] * xs[i] as a single 'dot' node """
+    ws, xs = list(ws), list(xs)
+    assert len(ws) == len(xs), "dot of sequences of different lengths"
+    if _foreign(ws + xs):
+        total = 0
+        for w, x in zip(ws, xs):
+            total = total + w * x
+        return total
+    ws = [_lift(w) for w in ws]
+    xs = [_lift(x) for x in xs]
+    total = 0
+    for w, x in zip(ws, xs):
+        total += w.data * x.data
+    return Value(total, ws + xs, 'dot')
+
+# numerically stable kernels, shared by the ops below, the compiler and Dual
+
+def _sigmoid(x):
+    # split on the sign so that exp never overflows
+    if x >= 0:
+        return 1 / (1 + math.exp(-x))
+    e = math.exp(x)
+    return e / (1 + e)
+
+def _softmax(xs):
+    # returns (softmax(xs), logsumexp(xs)), shifting by the max so exp never overflows
+    m = max(xs)
+    es = [math.exp(x - m) for x in xs]
+    total = 0.0
+    for e in es:
+        total += e
+    return [e / total for e in es], m + math.log(total)
+
+def logsumexp(values):
+    """ log(sum(exp(v) for v in values)) as a single node, stable for large values """
+    values = list(values)
+    if _foreign(values):
+        m = max(getattr(v, 'data', v) for v in values)
+        return m + _apply('log', sum([_apply('exp', v - m) for v in values]))
+    values = [_lift(v) for v in values]
+    probs, lse = _softmax([v.data for v in values])
+    return Value(lse, values, 'logsumexp', probs)
+
+def softmax(values):
+    """ the softmax of values as a list of nodes, each depending on all of values """
+    values = list(values)
+    if _foreign(values):
+        lse = logsumexp(values)
+        return [_apply('exp', v - lse) for v in values]
+    values = [_lift(v) for v in values]
+    probs, _ = _softmax([v.data for v in values])
+    return [Value(p, values, 'softmax', (i, probs)) for i, p in enumerate(probs)]
+
+# gradient checkpointing: trade compute for memory by not keeping a subgraph around
+
+class _Segment:
+    # shared state of one checkpoint() call
+    __slots__ = ('fn', 'grads', 'outputs')
+
+    def __init__(self, fn, n):
+        self.fn = fn
+        self.grads = [0] * n # gradients arriving at the segment's outputs
+        self.outputs = None # output data of the last replay, see Plan
+
+def _values(out):
+    # fn may return one Value or a list, and under no_grad nn modules return plain numbers
+    outs = out if isinstance(out, (list, tuple)) else [out]
+    return [o.data if isinstance(o, Value) else o for o in outs]
+
+def checkpoint(fn, inputs):
+    """
+    Computes fn(inputs) without keeping its inner graph. inputs is a list of
+    Values and fn returns a Value or a list of Values. The outputs hang off
+    a single 'checkpoint' node whose children are the inputs, and backward()
+    reruns fn on copies of the inputs to get their gradients. Anything fn
+    uses besides its inputs (e.g. parameters) gets its .grad as usual.
+    """
+    inputs = [v if isinstance(v, Value) else Value(v) for v in inputs]
+    if not _grad_enabled:
+        return fn(inputs)
+    with no_grad():
+        out = fn([Value(v.data) for v in inputs])
+    data = _values(out)
+    segment = _Segment(fn, len(data))
+    node = Value(0, inputs, 'checkpoint', segment)
+    outs = [Value(d, (node,), 'checkpoint_out', i) for i, d in enumerate(data)]
+    return outs if isinstance(out, (list, tuple)) else outs[0]
+
+# Gradient rules, one per op. Each takes the output node and adds its
+# contribution to the .grad of every child. Sharing one function per op
+# (instead of a closure per node) keeps nodes small and cheap to create.
+
+def _add_backward(out):
+    # Key insight: gradient of addition just passes through unchanged to every input
+    # If output needs to increase by X, all inputs should increase by X
+    for child in out._prev:
+        child.grad += out.grad    # Add (don't overwrite!) the gradient
+
+def _dot_backward(out):
+    # children are w_1..w_n followed by x_1..x_n, d(sum w_i*x_i)/dw_i = x_i and vice versa
+    n = len(out._prev) // 2
+    for w, x in zip(out._prev[:n], out._prev[n:]):
+        w.grad += x.data * out.grad
+        x.grad += w.data * out.grad
+
+def _neg_backward(out):
+    a, = out._prev
+    a.grad += -out.grad
+
+def _sub_backward(out):
+    a, b = out._prev
+    a.grad += out.grad
+    b.grad -= out.grad
+
+def _div_backward(out):
+    # f = a / b: df/da = 1/b, df/db = -a/b**2
+    a, b = out._prev
+    a.grad += (1 / b.data) * out.grad
+    b.grad += (-a.data / b.data**2) * out.grad
+
+def _mul_backward(out):
+    # Key insight: gradient of multiplication uses the "other" input's value
+    # If f = a * b, then df/da = b and df/db = a (basic calculus!)
+    a, b = out._prev
+    a.grad += b.data * out.grad
+    b.grad += a.data * out.grad
+
+def _pow_backward(out):
+    a, = out._prev
+    a.grad += (out._arg * a.data**(out._arg-1)) * out.grad
+
+def _relu_backward(out):
+    a, = out._prev
+    a.grad += (out.data > 0) * out.grad
+
+def _exp_backward(out):
+    a, = out._prev
+    a.grad += out.data * out.grad
+
+def _log_backward(out):
+    a, = out._prev
+    a.grad += (1 / a.data) * out.grad
+
+def _tanh_backward(out):
+    a, = out._prev
+    a.grad += (1 - out.data**2) * out.grad
+
+def _sigmoid_backward(out):
+    a, = out._prev
+    a.grad += (out.data * (1 - out.data)) * out.grad
+
+def _logsumexp_backward(out):
+    # d logsumexp / dx_j = softmax_j, kept in _arg from the forward pass
+    for x, p in zip(out._prev, out._arg):
+        x.grad += p * out.grad
+
+def _softmax_backward(out):
+    # d softmax_i / dx_j = p_i * (1[i == j] - p_j)
+    i, probs = out._arg
+    pi = probs[i]
+    for j, x in enumerate(out._prev):
+        x.grad += (pi * ((j == i) - probs[j])) * out.grad
+
+# the op of a node whose edges were released by backward()
+_FREED = 'freed'
+
+def _freed_backward(out):
+    raise RuntimeError("trying to backward through a part of the graph that was already freed, "
+                       "use retain_graph=True on the first backward()")
+
+def _checkpoint_out_backward(out):
+    node, = out._prev
+    node._arg.grads[out._arg] += out.grad
+
+def _checkpoint_backward(node):
+    # runs after every output of the segment (they are its parents), so all
+    # of their gradients are in: rerun fn with a graph and backprop through it
+    global _grad_enabled
+    segment = node._arg
+    prev, _grad_enabled = _grad_enabled, True
+    try:
+        inputs = [Value(v.data) for v in node._prev]
+        out = segment.fn(inputs)
+        outs = out if isinstance(out, (list, tuple)) else [out]
+        dot(outs, segment.grads).backward()
+    finally:
+        _grad_enabled = prev
+    for v, copy in zip(node._prev, inputs):
+        v.grad += copy.grad
+    segment.grads = [0] * len(segment.grads)
+
+_BACKWARD = {
+    '+': _add_backward,
+    '*': _mul_backward,
+    '**': _pow_backward,
+    'neg': _neg_backward,
+    '-': _sub_backward,
+    '/': _div_backward,
+    'ReLU': _relu_backward,
+    'dot': _dot_backward,
+    'exp': _exp_backward,
+    'log': _log_backward,
+    'tanh': _tanh_backward,
+    'sigmoid': _sigmoid_backward,
+    'logsumexp': _logsumexp_backward,
+    'softmax': _softmax_backward,
+    'checkpoint': _checkpoint_backward,
+    'checkpoint_out': _checkpoint_out_backward,
+    _FREED: _freed_backward,
+}
+
+# Vector-Jacobian rules for create_graph: the same derivatives as above, but
+# written with Value ops so that the gradients are differentiable themselves.
+# Each takes the output node and its gradient g (a Value) and returns the
+# gradient contributions for out._prev, in order.
+
+def _dot_vjp(out, g):
+    n = len(out._prev) // 2
+    ws, xs = out._prev[:n], out._prev[n:]
+    return [g * x for x in xs] + [g * w for w in ws]
+
+def _softmax_vjp(out, g):
+    i, _ = out._arg
+    xs = out._prev
+    lse = logsumexp(xs)
+    p = [(x - lse).exp() for x in xs]
+    return [g * (p[i] * ((1.0 if j == i else 0.0) - p[j])) for j in range(len(xs))]
+
+_VJP = {
+    '+': lambda out, g: [g] * len(out._prev),
+    '*': lambda out, g: [g * out._prev[1], g * out._prev[0]],
+    '**': lambda out, g: [g * (out._arg * out._prev[0]**(out._arg-1))],
+    'neg': lambda out, g: [g * -1.0],
+    '-': lambda out, g: [g, g * -1.0],
+    '/': lambda out, g: [g * out._prev[1]**-1, g * (-out._prev[0] * out._prev[1]**-2)],
+    'ReLU': lambda out, g: [g * (1.0 if out.data > 0 else 0.0)],
+    'dot': _dot_vjp,
+    'exp': lambda out, g: [g * out],
+    'log': lambda out, g: [g * out._prev[0]**-1],
+    'tanh': lambda out, g: [g * (1 - out**2)],
+    'sigmoid': lambda out, g: [g * (out * (1 - out))],
+    'logsumexp': lambda out, g: [g * (x - out).exp() for x in out._prev],
+    'softmax': _softmax_vjp,
+}
+
+def _vjp_sweep(outputs, seeds):
+    # one reverse sweep over the graph of all outputs, starting from the given
+    # gradient seeds; returns {node: gradient} without touching any .grad
+    grads = {}
+    for o, seed in zip(outputs, seeds):
+        grads[o] = grads[o] + seed if o in grads else seed
+    root = outputs[0]
+    if len(outputs) > 1:
+        root = Value(0) # joins the outputs' graphs, set directly since no_grad may be on
+        root._prev = tuple(outputs)
+    for v in reversed(root._build_topo()):
+        g = grads.get(v)
+        if g is None:
+            continue
+        if not v._prev:
+            if v._op == _FREED:
+                _freed_backward(v)
+            continue
+        if v._op not in _VJP:
+            raise NotImplementedError(f"op '{v._op}' has no vector-Jacobian rule")
+        for child, gc in zip(v._prev, _VJP[v._op](v, g)):
+            grads[child] = grads[child] + gc if child in grads else gc
+    return grads
+
+def _grad_graph(output):
+    # d output / d v as a Value with a graph, for every v that output depends on
+    global _grad_enabled
+    prev, _grad_enabled = _grad_enabled, True
+    try:
+        return _vjp_sweep([output], [Value(1.0)])
+    finally:
+        _grad_enabled = prev
+
+def grad(output, inputs, create_graph=False):
+    """
+    Returns [d output / d x for x in inputs] without touching any .grad.
+    With create_graph=True the gradients are Values that can be differentiated
+    again (see hvp), otherwise they are plain numbers.
+    """
+    grads = _grad_graph(output)
+    gs = [grads.get(x, Value(0.0)) for x in inputs]
+    return gs if create_graph else [g.data for g in gs]
+
+def hvp(output, inputs, v):
+    """
+    Hessian-vector product H @ v of output w.r.t. inputs, as a list of numbers.
+    Costs two backward sweeps, d/dx (grad(output) . v), and never forms H.
+    """
+    return grad(dot(grad(output, inputs, create_graph=True), v), inputs)
+
+class _Vector:
+    # a vector-valued gradient with one entry per output, see jacobian()
+    __slots__ = ('v',)
+
+    def __init__(self, v):
+        self.v = v
+
+    def __add__(self, other):
+        return _Vector([a + b for a, b in zip(self.v, other.v)])
+
+    def __mul__(self, other):
+        k = other.data if isinstance(other, Value) else other
+        return _Vector([a * k for a in self.v])
+
+    __rmul__ = __mul__
+
+def jacobian(fn, inputs):
+    """
+    Returns the Jacobian of fn at inputs as rows J[i][j] = d out_i / d inputs[j].
+    fn takes a list of Values and returns a Value or a list of them. All
+    outputs are seeded at once with unit vectors and propagated together, so
+    the graph is built and traversed once, however many outputs there are.
+    """
+    xs = [Value(x) for x in inputs]
+    out = fn(xs)
+    outs = out if isinstance(out, (list, tuple)) else [out]
+    m = len(outs)
+    seeds = [_Vector([1.0 if j == i else 0.0 for j in range(m)]) for i in range(m)]
+    with no_grad():
+        grads = _vjp_sweep(outs, seeds)
+    cols = [grads[x].v if x in grads else [0.0] * m for x in xs]
+    return [[col[i] for col in cols] for i in range(m)]
+
+# Forward rules, used only to replay a recorded graph with new leaf data (see Plan)
+
+def _add_forward(out):
+    first, *rest = out._prev
+    total = first.data
+    for v in rest:
+        total += v.data
+    out.data = total
+
+def _dot_forward(out):
+    n = len(out._prev) // 2
+    total = 0
+    for w, x in zip(out._prev[:n], out._prev[n:]):
+        total += w.data * x.data
+    out.data = total
+
+def _mul_forward(out):
+    a, b = out._prev
+    out.data = a.data * b.data
+
+def _pow_forward(out):
+    a, = out._prev
+    out.data = a.data**out._arg
+
+def _neg_forward(out):
+    out.data = -out._prev[0].data
+
+def _sub_forward(out):
+    a, b = out._prev
+    out.data = a.data - b.data
+
+def _div_forward(out):
+    a, b = out._prev
+    out.data = a.data / b.data
+
+def _relu_forward(out):
+    a, = out._prev
+    out.data = 0 if a.data < 0 else a.data
+
+def _exp_forward(out):
+    out.data = math.exp(out._prev[0].data)
+
+def _log_forward(out):
+    out.data = math.log(out._prev[0].data)
+
+def _tanh_forward(out):
+    out.data = math.tanh(out._prev[0].data)
+
+def _sigmoid_forward(out):
+    out.data = _sigmoid(out._prev[0].data)
+
+def _logsumexp_forward(out):
+    out._arg, out.data = _softmax([v.data for v in out._prev])
+
+def _softmax_forward(out):
+    i, _ = out._arg
+    probs, _ = _softmax([v.data for v in out._prev])
+    out.data, out._arg = probs[i], (i, probs)
+
+def _freed_forward(out):
+    # the node's children are gone, so it can't be recomputed and would keep stale data
+    raise RuntimeError("trying to replay a part of the graph that was already freed by backward(), "
+                       "use retain_graph=True or Plan.backward() instead")
+
+def _checkpoint_forward(node):
+    with no_grad():
+        node._arg.outputs = _values(node._arg.fn([Value(v.data) for v in node._prev]))
+
+def _checkpoint_out_forward(out):
+    node, = out._prev
+    out.data = node._arg.outputs[out._arg]
+
+_FORWARD = {
+    '+': _add_forward,
+    '*': _mul_forward,
+    '**': _pow_forward,
+    'neg': _neg_forward,
+    '-': _sub_forward,
+    '/': _div_forward,
+    'ReLU': _relu_forward,
+    'dot': _dot_forward,
+    'exp': _exp_forward,
+    'log': _log_forward,
+    'tanh': _tanh_forward,
+    'sigmoid': _sigmoid_forward,
+    'logsumexp': _logsumexp_forward,
+    'softmax': _softmax_forward,
+    'checkpoint': _checkpoint_forward,
+    'checkpoint_out': _checkpoint_out_forward,
+    _FREED: _freed_forward,
+}
+
+def register_op(op, backward, forward=None, vjp=None):
+    """
+    Adds the rules for nodes whose _op is op, for ops defined outside this
+    module (see micrograd.losses): backward(out) adds into the children's
+    .grad, forward(out) recomputes out.data for Plan replays, and vjp(out, g)
+    returns the children's gradients as Values for create_graph/jacobian.
+    """
+    _BACKWARD[op] = backward
+    if forward is not None:
+        _FORWARD[op] = forward
+    if vjp is not None:
+        _VJP[op] = vjp
+
+
+class Plan:
+    """
+    A recorded graph that can be replayed with new input data.
+
+    Build the graph once on placeholder input Values, then each step call
+    forward(data) and backward() instead of rebuilding the graph and
+    re-sorting it. Any other leaves (e.g. model parameters) are read live,
+    so updating their .data between steps is picked up by the next forward.
+    """
+
+    def __init__(self, output, inputs, key=None):
+        self.output = output
+        self.inputs = list(inputs)
+        self.key = key # identifies the structure the plan was built for, see Module.plan
+        self.topo = output._build_topo()
+
+    def forward(self, data):
+        assert len(data) == len(self.inputs), f"expected {len(self.inputs)} inputs, got {len(data)}"
+        for v, d in zip(self.inputs, data):
+            v.data = d
+        for v in self.topo:
+            v._forward()
+        return self.output.data
+
+    def backward(self):
+        # interior nodes start from zero like in a freshly built graph,
+        # leaves accumulate like they do in Value.backward()
+        for v in self.topo:
+            if v._prev:
+                v.grad = 0
+        self.output.grad = 1
+        for v in reversed(self.topo):
+            v._backward()
@@ -0,0 +1,181 @@
+# Losses as single fused graph nodes. Each takes the model outputs, the
+# targets and, optionally, the parameters to L2-regularize: the node's
+# children are the outputs, then the targets, then the parameters, its data
+# is the mean loss plus alpha * sum(p**2), and its backward rule writes the
+# analytic gradient of the whole thing in one go, instead of backpropagating
+# through a node per sample, per margin and per squared parameter.
+#
+# Targets are children rather than part of the op, so that they can be
+# Values: a Plan (or Module.plan) built on placeholder targets replays the
+# loss with new ones. Plain numbers are checked up front and become constants.
+
+from micrograd.engine import Value, register_op, logsumexp, _softmax, _lift
+
+def _node(data, outputs, targets, params, op, alpha, k=None):
+    outputs = [_lift(v) for v in outputs]
+    targets = [_lift(t) for t in targets]
+    return Value(data, outputs + targets + list(params), op, (alpha, len(outputs), len(targets), k))
+
+def _parts(out):
+    # a loss node's (outputs, targets, params)
+    _, n, m, _ = out._arg
+    return out._prev[:n], out._prev[n:n + m], out._prev[n + m:]
+
+def _check_targets(name, targets, n):
+    # targets as a list of Values and floats, one per output
+    targets = list(targets)
+    if len(targets) != n:
+        raise ValueError(f"{name} got {n} outputs but {len(targets)} targets")
+    checked = []
+    for t in targets:
+        if not isinstance(t, Value):
+            try:
+                t = float(t)
+            except (TypeError, ValueError):
+                raise TypeError(f"{name} targets must be numbers or Values, got {t!r}") from None
+        checked.append(t)
+    return checked
+
+def _reg(params, alpha):
+    total = 0.0
+    for p in params:
+        total += p.data * p.data
+    return alpha * total
+
+def _reg_backward(out, params):
+    alpha = out._arg[0]
+    for p in params:
+        p.grad += 2 * alpha * p.data * out.grad
+
+def _reg_vjp(out, g, params):
+    alpha = out._arg[0]
+    return [g * (2 * alpha * p) for p in params]
+
+# svm "max-margin" loss, as in demo.ipynb: mean(relu(1 - y * score))
+
+def _svm_data(scores, ys):
+    total = 0.0
+    for s, y in zip(scores, ys):
+        total += max(0.0, 1 - y * s)
+    return total / len(ys)
+
+def svm_loss(scores, ys, params=(), alpha=0.0):
+    """ mean(relu(1 - y*score)) + alpha * sum(p**2), scores are Values and ys are +-1, as numbers or Values """
+    ys = _check_targets('svm_loss', ys, len(scores))
+    data = _svm_data([s.data for s in scores], [getattr(y, 'data', y) for y in ys]) + _reg(params, alpha)
+    return _node(data, scores, ys, params, 'svm_loss', alpha)
+
+def _svm_backward(out):
+    scores, ys, params = _parts(out)
+    n = len(scores)
+    for s, y in zip(scores, ys):
+        if 1 - y.data * s.data > 0:
+            s.grad += (-y.data / n) * out.grad
+            y.grad += (-s.data / n) * out.grad
+    _reg_backward(out, params)
+
+def _svm_forward(out):
+    scores, ys, params = _parts(out)
+    out.data = _svm_data([s.data for s in scores], [y.data for y in ys]) + _reg(params, out._arg[0])
+
+def _svm_vjp(out, g):
+    scores, ys, params = _parts(out)
+    n = len(scores)
+    active = [1 - y.data * s.data > 0 for s, y in zip(scores, ys)]
+    return ([g * (y * (-1 / n)) if a else g * 0.0 for s, y, a in zip(scores, ys, active)] +
+            [g * (s * (-1 / n)) if a else g * 0.0 for s, y, a in zip(scores, ys, active)] +
+            _reg_vjp(out, g, params))
+
+register_op('svm_loss', _svm_backward, _svm_forward, _svm_vjp)
+
+# mean squared error: mean((pred - target)**2)
+
+def _mse_data(preds, targets):
+    total = 0.0
+    for p, t in zip(preds, targets):
+        total += (p - t)**2
+    return total / len(targets)
+
+def mse_loss(preds, targets, params=(), alpha=0.0):
+    """ mean((pred - target)**2) + alpha * sum(p**2), preds are Values and targets numbers or Values """
+    targets = _check_targets('mse_loss', targets, len(preds))
+    data = _mse_data([p.data for p in preds], [getattr(t, 'data', t) for t in targets]) + _reg(params, alpha)
+    return _node(data, preds, targets, params, 'mse_loss', alpha)
+
+def _mse_backward(out):
+    preds, targets, params = _parts(out)
+    n = len(preds)
+    for p, t in zip(preds, targets):
+        d = (2 * (p.data - t.data) / n) * out.grad
+        p.grad += d
+        t.grad -= d
+    _reg_backward(out, params)
+
+def _mse_forward(out):
+    preds, targets, params = _parts(out)
+    out.data = _mse_data([p.data for p in preds], [t.data for t in targets]) + _reg(params, out._arg[0])
+
+def _mse_vjp(out, g):
+    preds, targets, params = _parts(out)
+    n = len(preds)
+    grads = [g * ((p - t) * (2 / n)) for p, t in zip(preds, targets)]
+    return grads + [d * -1.0 for d in grads] + _reg_vjp(out, g, params)
+
+register_op('mse_loss', _mse_backward, _mse_forward, _mse_vjp)
+
+# softmax cross-entropy over a batch of class scores: mean(logsumexp(row) - row[target])
+
+def _ce_rows(logits, k):
+    return [logits[i:i+k] for i in range(0, len(logits), k)]
+
+def _ce_index(t, k):
+    # a target's class index; Values (e.g. Plan placeholders) are read as they are now
+    t = t.data if isinstance(t, Value) else t
+    if t != int(t) or not 0 <= t < k:
+        raise ValueError(f"cross_entropy target {t!r} is not a class index in range({k})")
+    return int(t)
+
+def _ce_data(logits, targets, k):
+    total = 0.0
+    for row, t in zip(_ce_rows(logits, k), targets):
+        total += _softmax(row)[1] - row[_ce_index(t, k)]
+    return total / len(targets)
+
+def cross_entropy(logits, targets, params=(), alpha=0.0):
+    """
+    mean over the batch of -log(softmax(row)[target]) + alpha * sum(p**2),
+    logits is a list of rows of Values (one per sample) and targets are
+    class indices, as numbers or Values. Computed through logsumexp, so
+    large scores don't overflow. The targets get no gradient.
+    """
+    k = len(logits[0])
+    targets = _check_targets('cross_entropy', targets, len(logits))
+    flat = [v for row in logits for v in row]
+    data = _ce_data([v.data for v in flat], targets, k) + _reg(params, alpha)
+    return _node(data, flat, targets, params, 'cross_entropy', alpha, k)
+
+def _ce_backward(out):
+    logits, targets, params = _parts(out)
+    k, b = out._arg[3], len(targets)
+    for row, t in zip(_ce_rows(logits, k), targets):
+        probs, _ = _softmax([v.data for v in row])
+        t = _ce_index(t, k)
+        for j, v in enumerate(row):
+            v.grad += ((probs[j] - (j == t)) / b) * out.grad
+    _reg_backward(out, params)
+
+def _ce_forward(out):
+    logits, targets, params = _parts(out)
+    out.data = _ce_data([v.data for v in logits], targets, out._arg[3]) + _reg(params, out._arg[0])
+
+def _ce_vjp(out, g):
+    logits, targets, params = _parts(out)
+    k, b = out._arg[3], len(targets)
+    grads = []
+    for row, t in zip(_ce_rows(logits, k), targets):
+        lse = logsumexp(row)
+        t = _ce_index(t, k)
+        grads += [g * (((v - lse).exp() - (1.0 if j == t else 0.0)) * (1 / b)) for j, v in enumerate(row)]
+    return grads + [g * 0.0 for _ in targets] + _reg_vjp(out, g, params)
+
+register_op('cross_entropy', _ce_backward, _ce_forward, _ce_vjp)
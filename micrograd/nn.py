@@ -1,31 +1,238 @@
 import random
-from micrograd.engine import Value
+from array import array
+from micrograd.engine import Value, Plan, is_grad_enabled, dot, checkpoint, _FREED
+from micrograd.tensor import Tensor, np
+
+def _is_batch(x):
+    # a 2-D (batch, nin) array or Tensor, as opposed to a single list of inputs
+    return isinstance(x, Tensor) or (np is not None and isinstance(x, np.ndarray) and x.ndim == 2)
+
+class Parameter(Value):
+    """ a parameter of a packed module: an ordinary leaf Value that is slot i of a ParameterBuffer """
+
+    __slots__ = ('_buffer', '_index')
+
+    def __init__(self, data, buffer, index):
+        super().__init__(data)
+        self._buffer = buffer
+        self._index = index
+
+class ParameterBuffer:
+    """
+    All parameters of a model gathered into two contiguous float64 arrays,
+    data and grad, with a Parameter per slot. The Parameters keep their own
+    data and grad like any Value, so building and backpropagating graphs is
+    as fast as unpacked; bulk operations (optimizer steps, gradient
+    all-reduce, save) gather() the values into the arrays in one pass, work
+    on the arrays, and scatter() the results back.
+
+    A buffer loaded by micrograd.serialize.load starts out with no
+    Parameters and no grad array: data holds the values, and the Parameters
+    are created (and bound into its module) the first time params is read.
+    """
+
+    def __init__(self, values):
+        values = list(values)
+        self.data = array('d', [v.data for v in values])
+        self.grad = array('d', [v.grad for v in values])
+        self._params = [Parameter(d, self, i) for i, d in enumerate(self.data)]
+        self._module = None
+        for p, g in zip(self._params, self.grad):
+            p.grad = g
+
+    @classmethod
+    def _loaded(cls, data):
+        # a buffer over the float64s data whose Parameters don't exist yet, see serialize.load
+        buffer = cls.__new__(cls)
+        buffer.data = data
+        buffer.grad = None # no gradients without Parameters
+        buffer._params = None
+        buffer._module = None # the module to bind the Parameters into once they are created
+        return buffer
+
+    @property
+    def params(self):
+        if self._params is None:
+            self.grad = array('d', bytes(8 * len(self.data)))
+            self._params = [Parameter(d, self, i) for i, d in enumerate(self.data)]
+            self._module._bind(iter(self._params))
+        return self._params
+
+    def gather(self):
+        """ copies the parameters' data and grad into the arrays """
+        if self._params is None:
+            return # the arrays are all there is
+        self.data[:] = array('d', [p.data for p in self._params])
+        self.grad[:] = array('d', [p.grad for p in self._params])
+
+    def scatter(self):
+        """ copies the arrays back into the parameters' data and grad """
+        if self._params is None:
+            return
+        for p, d, g in zip(self._params, self.data, self.grad):
+            p.data = d
+            p.grad = g
+
+    def zero_grad(self):
+        if self._params is None:
+            return
+        self.grad[:] = array('d', bytes(8 * len(self.grad)))
+        for p in self._params:
+            p.grad = 0
+
+    def __getstate__(self):
+        # data can be a memoryview of a memory-mapped file (see micrograd.serialize.load),
+        # which can't be pickled, so it travels as an array
+        state = dict(self.__dict__)
+        state['data'] = array('d', self.data)
+        return state
+
+    def __len__(self):
+        return len(self.data)
 
 class Module:
 
+    _buffer = None # set by pack()
+
     def zero_grad(self):
+        if self._buffer is not None:
+            self._buffer.zero_grad()
+            return
         for p in self.parameters():
             p.grad = 0
 
     def parameters(self):
         return []
 
+    def pack(self):
+        """
+        Gathers all parameters into one ParameterBuffer, replacing them with
+        its Parameters, and returns the buffer. Graphs built before packing
+        still point at the old Values.
+        """
+        buffer = ParameterBuffer(self.parameters())
+        self._bind(iter(buffer.params))
+        self._buffer = buffer
+        return buffer
+
+    def _bind(self, params):
+        # take this module's parameters, in parameters() order, from the params iterator
+        raise NotImplementedError(f"{type(self).__name__} does not support pack()")
+
+    def _config(self):
+        # the constructor arguments that rebuild this module's structure, see micrograd.serialize
+        raise NotImplementedError(f"{type(self).__name__} does not support save()")
+
+    def plan(self, loss_fn, ninputs):
+        """
+        Returns a Plan for loss_fn(inputs), where inputs is a flat list of
+        ninputs placeholder Values. The plan is built on the first call and
+        reused as long as loss_fn (the same function object, so define it
+        once outside the loop), ninputs and the parameters stay the same, so
+        a training loop can call this every step. A plan whose graph was
+        freed by a plain loss.backward() is rebuilt.
+        """
+        key = (loss_fn, ninputs, tuple(id(p) for p in self.parameters()))
+        plan = getattr(self, '_plan', None)
+        if plan is None or plan.key != key or plan.output._op == _FREED:
+            inputs = [Value(0) for _ in range(ninputs)]
+            plan = self._plan = Plan(loss_fn(inputs), inputs, key)
+        return plan
+
+class _loading_into:
+    # while active (see micrograd.serialize.load), new Neurons skip their random init:
+    # each takes the next nin + 1 slots of buffer, in construction order, which is
+    # parameters() order, and only gets Parameters when it is first trained
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.count = 0 # slots taken so far
+
+    def __enter__(self):
+        global _loading
+        self.prev, _loading = _loading, self
+        return self
+
+    def __exit__(self, *exc):
+        global _loading
+        _loading = self.prev
+
+_loading = None
+
 class Neuron(Module):
 
     def __init__(self, nin, nonlin=True):
+        self.nonlin = nonlin
+        if _loading is not None:
+            # (buffer, index of w[0], nin); w and b are created by __getattr__ when first needed
+            self._slot = (_loading.buffer, _loading.count, nin)
+            _loading.count += nin + 1
+            return
         self.w = [Value(random.uniform(-1,1)) for _ in range(nin)]
         self.b = Value(0)
-        self.nonlin = nonlin
+
+    def __getattr__(self, name):
+        # only called for attributes that aren't set: w and b of a loaded Neuron
+        # appear once its buffer's Parameters are created, which binds them into the model
+        slot = self.__dict__.get('_slot')
+        if slot is None or name not in ('w', 'b'):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        slot[0].params
+        return self.__dict__[name]
+
+    def _nin(self):
+        slot = self.__dict__.get('_slot')
+        return slot[2] if slot is not None else len(self.w)
+
+    def _numbers(self):
+        # the weights and the bias as plain numbers, read from the buffer while a loaded Neuron has no Parameters
+        if 'w' not in self.__dict__:
+            buffer, i, nin = self._slot
+            return buffer.data[i:i + nin].tolist(), buffer.data[i + nin]
+        return [wi.data for wi in self.w], self.b.data
 
     def __call__(self, x):
-        act = sum((wi*xi for wi,xi in zip(self.w, x)), self.b)
+        if _is_batch(x):
+            if not is_grad_enabled():
+                X = x.data if isinstance(x, Tensor) else x
+                w, b = self._numbers()
+                act = X @ np.array(w) + b
+                return np.maximum(act, 0) if self.nonlin else act
+            # one matmul over the whole (batch, nin) input, giving a (batch,) Tensor
+            w = Tensor.from_values(self.w, (len(self.w),))
+            act = x @ w + Tensor.from_values([self.b], ())
+        elif not is_grad_enabled():
+            # inference: plain float arithmetic, no graph, same order as dot() + b
+            act = 0
+            if 'w' in self.__dict__:
+                for wi, xi in zip(self.w, x):
+                    act += wi.data * (xi.data if isinstance(xi, Value) else xi)
+                act += self.b.data
+            else: # loaded and not trained yet, see _loading_into
+                w, b = self._numbers()
+                for wi, xi in zip(w, x):
+                    act += wi * (xi.data if isinstance(xi, Value) else xi)
+                act += b
+            return (0 if act < 0 else act) if self.nonlin else act
+        else:
+            # one fused node for w.x instead of nin '*' and nin '+' nodes
+            act = dot(self.w, x) + self.b
         return act.relu() if self.nonlin else act
 
     def parameters(self):
+        if self._buffer is not None:
+            return list(self._buffer.params)
         return self.w + [self.b]
 
+    def _bind(self, params):
+        self.w = [next(params) for _ in range(self._nin())]
+        self.b = next(params)
+
+    def _config(self):
+        return {'nin': self._nin(), 'nonlin': self.nonlin}
+
     def __repr__(self):
-        return f"{'ReLU' if self.nonlin else 'Linear'}Neuron({len(self.w)})"
+        return f"{'ReLU' if self.nonlin else 'Linear'}Neuron({self._nin()})"
 
 class Layer(Module):
 
@@ -33,28 +240,119 @@ class Layer(Module):
         self.neurons = [Neuron(nin, **kwargs) for _ in range(nout)]
 
     def __call__(self, x):
+        if _is_batch(x):
+            nin, nout = self.neurons[0]._nin(), len(self.neurons)
+            nonlin = self.neurons[0].nonlin
+            if not is_grad_enabled():
+                X = x.data if isinstance(x, Tensor) else x
+                w, b = zip(*(n._numbers() for n in self.neurons))
+                act = X @ np.array(w).T.copy() + np.array(b)
+                return np.maximum(act, 0) if nonlin else act
+            ws = [n.w[i] for i in range(nin) for n in self.neurons]
+            bs = [n.b for n in self.neurons]
+            # evaluate all neurons on the whole batch at once, giving a (batch, nout) Tensor
+            act = x @ Tensor.from_values(ws, (nin, nout)) + Tensor.from_values(bs, (nout,))
+            return act.relu() if nonlin else act
         out = [n(x) for n in self.neurons]
         return out[0] if len(out) == 1 else out
 
     def parameters(self):
+        if self._buffer is not None:
+            return list(self._buffer.params)
         return [p for n in self.neurons for p in n.parameters()]
 
+    def _bind(self, params):
+        for n in self.neurons:
+            n._bind(params)
+
+    def _config(self):
+        return {'nin': self.neurons[0]._nin(), 'nout': len(self.neurons), 'nonlin': self.neurons[0].nonlin}
+
     def __repr__(self):
         return f"Layer of [{', '.join(str(n) for n in self.neurons)}]"
 
 class MLP(Module):
 
-    def __init__(self, nin, nouts):
+    def __init__(self, nin, nouts, checkpoint_every=0):
         sz = [nin] + nouts
         self.layers = [Layer(sz[i], sz[i+1], nonlin=i!=len(nouts)-1) for i in range(len(nouts))]
+        # if > 0, run the layers in segments of this many under checkpoint(): only the
+        # activations between segments are kept, the rest is recomputed in backward()
+        self.checkpoint_every = checkpoint_every
 
     def __call__(self, x):
-        for layer in self.layers:
+        k = self.checkpoint_every
+        if k and is_grad_enabled() and not _is_batch(x):
+            for i in range(0, len(self.layers), k):
+                x = checkpoint(lambda xs, layers=self.layers[i:i+k]: self._run(layers, xs), x)
+            return x
+        return self._run(self.layers, x)
+
+    @staticmethod
+    def _run(layers, x):
+        for layer in layers:
             x = layer(x)
         return x
 
     def parameters(self):
+        if self._buffer is not None:
+            return list(self._buffer.params)
         return [p for layer in self.layers for p in layer.parameters()]
 
+    def _bind(self, params):
+        for layer in self.layers:
+            layer._bind(params)
+
+    def _config(self):
+        return {'nin': self.layers[0].neurons[0]._nin(), 'nouts': [len(layer.neurons) for layer in self.layers],
+                'checkpoint_every': self.checkpoint_every}
+
     def __repr__(self):
         return f"MLP of [{', '.join(str(layer) for layer in self.layers)}]"
+
+class TensorLayer(Module):
+    """ a Layer whose weights are a single (nin, nout) Tensor, evaluated with one matmul """
+
+    def __init__(self, nin, nout, nonlin=True):
+        if np is None:
+            raise ImportError("TensorLayer requires numpy")
+        self.W = Tensor(np.random.uniform(-1, 1, (nin, nout)))
+        self.b = Tensor(np.zeros(nout))
+        self.nonlin = nonlin
+
+    def __call__(self, x):
+        # x is a (nin,) vector or a (batch, nin) matrix
+        act = x @ self.W + self.b
+        return act.relu() if self.nonlin else act
+
+    def zero_grad(self):
+        # a Tensor's grad is an array of its shape, not a number
+        for p in self.parameters():
+            p.grad = np.zeros_like(p.data)
+
+    def parameters(self):
+        return [self.W, self.b]
+
+    def __repr__(self):
+        return f"TensorLayer of {'ReLU' if self.nonlin else 'Linear'}Neurons({self.W.shape[0]}x{self.W.shape[1]})"
+
+class TensorMLP(Module):
+
+    def __init__(self, nin, nouts):
+        sz = [nin] + nouts
+        self.layers = [TensorLayer(sz[i], sz[i+1], nonlin=i!=len(nouts)-1) for i in range(len(nouts))]
+
+    def __call__(self, x):
+        for layer in self.layers:
+            x = layer(x)
+        return x
+
+    def zero_grad(self):
+        for layer in self.layers:
+            layer.zero_grad()
+
+    def parameters(self):
+        return [p for layer in self.layers for p in layer.parameters()]
+
+    def __repr__(self):
+        return f"TensorMLP of [{', '.join(str(layer) for layer in self.layers)}]"
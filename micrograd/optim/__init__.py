@@ -0,0 +1,3 @@
+from micrograd.optim.optimizer import Optimizer
+from micrograd.optim.sgd import SGD
+from micrograd.optim.adam import Adam, AdamW
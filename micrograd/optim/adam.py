@@ -0,0 +1,41 @@
+from micrograd.optim.optimizer import Optimizer
+
+class Adam(Optimizer):
+    """ Adam (Kingma & Ba, 2014); weight_decay is added to the gradient as an L2 term """
+
+    decoupled = False
+
+    def __init__(self, params, lr=0.001, betas=(0.9, 0.999), eps=1e-8, weight_decay=0.0):
+        super().__init__(params, lr)
+        self.betas = betas
+        self.eps = eps
+        self.weight_decay = weight_decay
+        self.m = self._zeros() # first moment
+        self.v = self._zeros() # second moment
+
+    def _update(self, data, grad):
+        lr, eps, wd, decoupled = self.lr, self.eps, self.weight_decay, self.decoupled
+        b1, b2 = self.betas
+        c1 = 1 - b1**self.steps # bias corrections
+        c2 = 1 - b2**self.steps
+        m, v = self.m, self.v
+        for i in range(len(data)):
+            g = grad[i]
+            if wd and not decoupled:
+                g += wd * data[i]
+            m[i] = b1 * m[i] + (1 - b1) * g
+            v[i] = b2 * v[i] + (1 - b2) * g * g
+            if wd and decoupled:
+                data[i] -= lr * wd * data[i]
+            data[i] -= lr * (m[i] / c1) / ((v[i] / c2)**0.5 + eps)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(lr={self.lr}, betas={self.betas}, eps={self.eps}, weight_decay={self.weight_decay})"
+
+class AdamW(Adam):
+    """ Adam with decoupled weight decay (Loshchilov & Hutter, 2017) """
+
+    decoupled = True
+
+    def __init__(self, params, lr=0.001, betas=(0.9, 0.999), eps=1e-8, weight_decay=0.01):
+        super().__init__(params, lr, betas, eps, weight_decay)
@@ -0,0 +1,45 @@
+from array import array
+
+class Optimizer:
+    """
+    Base class for optimizers. The parameter list is captured once, and all
+    per-parameter state lives in flat array('d') buffers indexed like it, so
+    a step is one pass over contiguous memory: gather data and grads, run
+    the update kernel over the arrays, write the new data back. If params
+    are exactly the parameters of a packed model (see Module.pack), they are
+    gathered into its ParameterBuffer arrays instead of freshly allocated ones.
+    """
+
+    def __init__(self, params, lr):
+        self.params = list(params)
+        self.lr = lr
+        self.steps = 0
+        buffer = getattr(self.params[0], '_buffer', None) if self.params else None
+        self.buffer = buffer if buffer is not None and buffer.params == self.params else None
+
+    def _zeros(self):
+        return array('d', bytes(8 * len(self.params)))
+
+    def zero_grad(self):
+        if self.buffer is not None:
+            self.buffer.zero_grad()
+            return
+        for p in self.params:
+            p.grad = 0
+
+    def step(self):
+        self.steps += 1
+        if self.buffer is not None:
+            self.buffer.gather()
+            self._update(self.buffer.data, self.buffer.grad)
+            self.buffer.scatter()
+            return
+        data = array('d', [p.data for p in self.params])
+        grad = array('d', [p.grad for p in self.params])
+        self._update(data, grad)
+        for p, d in zip(self.params, data):
+            p.data = d
+
+    def _update(self, data, grad):
+        # update data in place from grad, one slot per parameter
+        raise NotImplementedError
@@ -0,0 +1,27 @@
+from micrograd.optim.optimizer import Optimizer
+
+class SGD(Optimizer):
+    """ stochastic gradient descent, with optional (Nesterov) momentum and L2 weight decay """
+
+    def __init__(self, params, lr=0.01, momentum=0.0, nesterov=False, weight_decay=0.0):
+        super().__init__(params, lr)
+        assert not nesterov or momentum > 0, "Nesterov momentum requires a momentum"
+        self.momentum = momentum
+        self.nesterov = nesterov
+        self.weight_decay = weight_decay
+        self.velocity = self._zeros()
+
+    def _update(self, data, grad):
+        lr, mu, wd, nesterov = self.lr, self.momentum, self.weight_decay, self.nesterov
+        v = self.velocity
+        for i in range(len(data)):
+            g = grad[i]
+            if wd:
+                g += wd * data[i]
+            if mu:
+                v[i] = mu * v[i] + g
+                g = g + mu * v[i] if nesterov else v[i]
+            data[i] -= lr * g
+
+    def __repr__(self):
+        return f"SGD(lr={self.lr}, momentum={self.momentum}, nesterov={self.nesterov}, weight_decay={self.weight_decay})"
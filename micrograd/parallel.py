@@ -0,0 +1,90 @@
+import multiprocessing
+from array import array
+
+# per-process state of a pool worker, set once by _init_worker
+_worker = {}
+
+def _init_worker(model, loss_fn):
+    _worker['model'] = model
+    _worker['params'] = model.parameters()
+    _worker['loss_fn'] = loss_fn
+
+def _shard_step(args):
+    # forward + backward on one shard, against the master's current parameters
+    data, X, y = args
+    model = _worker['model']
+    if model._buffer is not None:
+        model._buffer.data[:] = data
+        model._buffer.zero_grad()
+        model._buffer.scatter()
+    else:
+        for p, d in zip(_worker['params'], data):
+            p.data = d
+            p.grad = 0
+    loss = _worker['loss_fn'](model, X, y)
+    loss.backward()
+    if model._buffer is not None:
+        model._buffer.gather()
+        return loss.data, model._buffer.grad
+    return loss.data, [p.grad for p in _worker['params']]
+
+class DataParallel:
+    """
+    Splits each minibatch across a pool of worker processes. Every worker
+    holds its own copy of the model; a step sends it the current parameter
+    values and one shard, runs loss_fn(model, X, y) and backward() there,
+    and the shard gradients are summed back into the master model's .grad.
+
+    loss_fn must be picklable (a module level function) and return the mean
+    over its samples plus any terms that don't depend on the batch (e.g. L2
+    regularization). Shards are then weighted by their size, which makes the
+    step equal to running loss_fn on the whole minibatch.
+
+    With a packed model (see Module.pack) parameters and gradients travel
+    as the ParameterBuffer arrays instead of lists of floats.
+    """
+
+    def __init__(self, model, loss_fn, processes=None):
+        self.model = model
+        self.params = model.parameters()
+        self.processes = processes or multiprocessing.cpu_count()
+        self.pool = multiprocessing.Pool(self.processes, _init_worker, (model, loss_fn))
+
+    def step(self, X, y):
+        """ accumulates the gradient of the minibatch loss into the model's .grad, returns the loss """
+        n = len(X)
+        k = min(self.processes, n)
+        bounds = [n * i // k for i in range(k + 1)]
+        buffer = self.model._buffer
+        if buffer is not None:
+            buffer.gather()
+        data = buffer.data if buffer is not None else [p.data for p in self.params]
+        if isinstance(data, memoryview): # a memory-mapped model, see micrograd.serialize.load
+            data = array('d', data)
+        shards = [(data, X[lo:hi], y[lo:hi]) for lo, hi in zip(bounds, bounds[1:])]
+
+        # all-reduce, in shard order so the result doesn't depend on scheduling
+        total = 0.0
+        grad = buffer.grad if buffer is not None else None
+        for (_, Xs, _), (loss, grads) in zip(shards, self.pool.map(_shard_step, shards)):
+            w = len(Xs) / n
+            total += w * loss
+            if grad is not None:
+                for i, g in enumerate(grads):
+                    grad[i] += w * g
+            else:
+                for p, g in zip(self.params, grads):
+                    p.grad += w * g
+        if buffer is not None:
+            buffer.scatter()
+        return total
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
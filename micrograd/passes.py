@@ -0,0 +1,53 @@
+import math
+from micrograd.engine import Value, _Constant, _FORWARD
+
+def _foldable(v, children):
+    # a pure op whose inputs are all constants has a constant result; checkpoint
+    # nodes are not pure, fn may read parameters that are not among the children
+    return (v._op in _FORWARD and not v._op.startswith('checkpoint')
+            and all(isinstance(c, _Constant) for c in children))
+
+def _key(v, children):
+    # nodes with the same op, _arg and (already deduplicated) children compute the same thing
+    if isinstance(v, _Constant):
+        # the sign is part of the key so that 0.0 and -0.0 stay apart
+        return ('const', type(v.data), v.data, math.copysign(1.0, v.data))
+    ids = [id(c) for c in children]
+    if v._op in ('+', '*') and len(ids) == 2:
+        ids.sort() # a + b and b + a round the same, so they are the same node
+    key = (v._op, v._arg, tuple(ids))
+    try:
+        hash(key)
+    except TypeError: # an unhashable _arg, e.g. the probabilities of a softmax node
+        return None
+    return key
+
+def optimize(output):
+    """
+    Rewrites the graph of output before backward() and returns the new output.
+
+    Subtrees that only depend on constants (the numbers wrapped by ops, like
+    the 2 in x * 2) are folded into a single constant, and nodes that compute
+    the same op on the same children are merged into one. Leaves are kept as
+    they are, so backward() on the result fills in the same .grad as it would
+    on output, up to rounding: a merged node adds up its parents' gradients
+    before passing them on. Nodes that are left unchanged are reused rather
+    than copied, so the old graph should not be used afterwards.
+    """
+    new = {} # node of the old graph -> its replacement
+    seen = {} # _key -> the first node with that key
+    for v in output._build_topo():
+        children = tuple(new[c] for c in v._prev)
+        if v._prev and _foldable(v, children):
+            node = _Constant(v.data)
+        elif children == v._prev:
+            node = v
+        else:
+            node = Value(v.data)
+            node._prev, node._op, node._arg = children, v._op, v._arg
+        if node._prev or isinstance(node, _Constant):
+            key = _key(node, children)
+            if key is not None:
+                node = seen.setdefault(key, node)
+        new[v] = node
+    return new[output]
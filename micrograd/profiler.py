@@ -0,0 +1,222 @@
+import json
+import sys
+import time
+from micrograd import engine
+from micrograd.engine import Value, Plan, _Constant
+from micrograd.nn import Module
+
+# Value methods and engine functions that build a node, and the op they build
+_METHODS = {'__add__': '+', '__mul__': '*', '__pow__': '**', '__neg__': 'neg', '__sub__': '-',
+            '__truediv__': '/', 'relu': 'ReLU', 'exp': 'exp', 'log': 'log', 'tanh': 'tanh',
+            'sigmoid': 'sigmoid'}
+_FUNCTIONS = {'sum': '+', 'dot': 'dot', 'logsumexp': 'logsumexp', 'softmax': 'softmax'}
+
+def _op_key(op, arg):
+    # ** gets a row per exponent, as x**2 and x**-1 are quite different ops
+    return f'**{arg}' if op == '**' else op
+
+class _Stats:
+    __slots__ = ('calls', 'nodes', 'allocs', 'forward', 'backward')
+
+    def __init__(self):
+        self.calls = self.nodes = self.allocs = 0
+        self.forward = self.backward = 0.0
+
+class _StatsDict(dict):
+    def __missing__(self, key):
+        stats = self[key] = _Stats()
+        return stats
+
+_MISSING = object() # an attribute that _patch added rather than replaced
+
+def _modules(cls=Module):
+    yield cls
+    for sub in cls.__subclasses__():
+        yield from _modules(sub)
+
+class profile:
+    """
+    Context manager that records where the time of Value computations goes.
+
+    Per op type (+, *, **2, ReLU, ...) and per Module class it counts calls,
+    graph nodes and Value allocations, and measures forward and backward
+    time. Nothing is instrumented outside the with block: entering it wraps
+    the op methods, the engine's rule tables and every Module's __call__,
+    and leaving it puts the originals back, so a disabled profiler costs
+    nothing.
+
+    Module numbers are inclusive: an MLP's row also covers its Layers and
+    Neurons. A node's backward time is charged to the modules it was built in.
+    An op's allocations are the Values created while it runs, e.g. x * 2 is one
+    '*' node but two allocations, the 2 being wrapped into a constant leaf.
+    """
+
+    def __init__(self):
+        self.ops = _StatsDict()
+        self.modules = _StatsDict()
+        self.events = [] # complete events for the Chrome trace
+        self._undo = []
+
+    # --- instrumentation
+
+    def _patch(self, owner, name, value):
+        self._undo.append((owner, name, getattr(owner, name, _MISSING)))
+        setattr(owner, name, value)
+
+    def __enter__(self):
+        self._op_stack = [] # ops whose forward is running, innermost last
+        self._scope = () # modules whose __call__ is running, outermost first
+        self._owner = {} # id of an interior node -> _scope when it was created, while the node is alive
+        self._t0 = time.perf_counter()
+
+        init = Value.__init__
+        def __init__(v, data, _children=(), _op='', _arg=None):
+            init(v, data, _children, _op, _arg)
+            if v._prev:
+                key = _op_key(v._op, v._arg)
+            else:
+                key = 'const' if isinstance(v, _Constant) else 'leaf'
+            self.ops[key].nodes += 1
+            self.ops[self._op_stack[-1] if self._op_stack else key].allocs += 1
+            for m in self._scope:
+                stats = self.modules[m]
+                stats.allocs += 1
+                stats.nodes += bool(v._prev)
+            if v._prev: # only nodes with a rule are ever looked up
+                self._owner[id(v)] = self._scope
+        self._patch(Value, '__init__', __init__)
+        # drop a node's entry when it is freed, so the map only ever holds the live
+        # graph rather than every node created in the block (Values can't be weakly referenced)
+        owner = self._owner
+        self._patch(Value, '__del__', lambda v: owner.pop(id(v), None))
+
+        for name, op in _METHODS.items():
+            self._patch(Value, name, self._timed(getattr(Value, name), op))
+        # module functions are also reached through names imported from engine, e.g. nn's dot
+        modules = [m for name, m in list(sys.modules.items())
+                   if m is not None and (name == '__main__' or name.split('.')[0] == 'micrograd')]
+        for name, op in _FUNCTIONS.items():
+            fn = getattr(engine, name)
+            timed = self._timed(fn, op)
+            for module in modules:
+                for attr, value in list(vars(module).items()):
+                    if value is fn:
+                        self._patch(module, attr, timed)
+
+        for table, field in ((engine._BACKWARD, 'backward'), (engine._FORWARD, 'forward')):
+            for op, rule in list(table.items()):
+                self._patch_rule(table, op, rule, field)
+
+        for cls in _modules():
+            if '__call__' in vars(cls):
+                self._patch(cls, '__call__', self._timed_module(cls.__call__))
+        self._patch(Value, 'backward', self._traced(Value.backward, 'backward'))
+        self._patch(Plan, 'forward', self._traced(Plan.forward, 'Plan.forward'))
+        self._patch(Plan, 'backward', self._traced(Plan.backward, 'Plan.backward'))
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, value in reversed(self._undo):
+            if isinstance(owner, dict):
+                owner[name] = value
+            elif value is _MISSING:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, value)
+        self._undo = []
+        self._owner = {}
+
+    def _timed(self, fn, op):
+        ops, stack = self.ops, self._op_stack
+        def timed(*args, **kwargs):
+            key = f'**{args[1]}' if op == '**' else op
+            stack.append(key)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stats = ops[key]
+                stats.forward += time.perf_counter() - t0
+                stats.calls += 1
+                stack.pop()
+        return timed
+
+    def _patch_rule(self, table, op, rule, field):
+        ops, modules, owner = self.ops, self.modules, self._owner
+        def timed(out):
+            t0 = time.perf_counter()
+            rule(out)
+            dt = time.perf_counter() - t0
+            stats = ops[_op_key(out._op, out._arg)]
+            setattr(stats, field, getattr(stats, field) + dt)
+            for m in owner.get(id(out), ()):
+                stats = modules[m]
+                setattr(stats, field, getattr(stats, field) + dt)
+        self._undo.append((table, op, rule))
+        table[op] = timed
+
+    def _timed_module(self, call):
+        def timed(module, *args, **kwargs):
+            name = type(module).__name__
+            outer = self._scope
+            self._scope = outer + (name,)
+            t0 = time.perf_counter()
+            try:
+                return call(module, *args, **kwargs)
+            finally:
+                t1 = time.perf_counter()
+                self._scope = outer
+                stats = self.modules[name]
+                stats.forward += t1 - t0
+                stats.calls += 1
+                self._event(name, 'module', t0, t1)
+        return timed
+
+    def _traced(self, fn, name):
+        def traced(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._event(name, 'engine', t0, time.perf_counter())
+        return traced
+
+    def _event(self, name, cat, t0, t1):
+        self.events.append({'name': name, 'cat': cat, 'ph': 'X', 'pid': 0, 'tid': 0,
+                            'ts': (t0 - self._t0) * 1e6, 'dur': (t1 - t0) * 1e6})
+
+    # --- reporting
+
+    def table(self, sort_by='total'):
+        """ the stats as a text table, ops first, then modules, each sorted by sort_by """
+        def rows(stats):
+            total = lambda s: s.forward + s.backward
+            key = total if sort_by == 'total' else lambda s: getattr(s, sort_by)
+            return sorted(stats.items(), key=lambda kv: key(kv[1]), reverse=True)
+
+        lines = []
+        for title, stats in (('op', self.ops), ('module', self.modules)):
+            lines.append(f"{title:<12} {'calls':>9} {'nodes':>9} {'allocs':>9} "
+                         f"{'forward ms':>11} {'backward ms':>12} {'total ms':>9}")
+            for name, s in rows(stats):
+                lines.append(f"{name:<12} {s.calls:>9} {s.nodes:>9} {s.allocs:>9} {s.forward * 1e3:>11.3f} "
+                             f"{s.backward * 1e3:>12.3f} {(s.forward + s.backward) * 1e3:>9.3f}")
+            lines.append('')
+        return '\n'.join(lines)
+
+    def chrome_trace(self):
+        """
+        The recorded module calls and backward passes as Chrome trace events,
+        with the per-op totals as counters at the end, for chrome://tracing
+        or https://ui.perfetto.dev
+        """
+        end = max((e['ts'] + e['dur'] for e in self.events), default=0.0)
+        counters = [{'name': f'op {name}', 'ph': 'C', 'pid': 0, 'ts': end,
+                     'args': {'forward_ms': s.forward * 1e3, 'backward_ms': s.backward * 1e3,
+                              'nodes': s.nodes, 'allocs': s.allocs}}
+                    for name, s in self.ops.items()]
+        return {'traceEvents': self.events + counters, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
@@ -0,0 +1,86 @@
+import json
+import mmap as _mmap
+import struct
+import sys
+from array import array
+from micrograd import nn
+
+# File layout: MAGIC, the header length as a little-endian uint32, a JSON header
+# describing the module, padded with spaces so the parameters start on a 64 byte
+# boundary, then every parameter as a little-endian float64, in parameters() order.
+MAGIC = b'MGRD'
+VERSION = 1
+_ALIGN = 64
+
+def save(module, path):
+    """
+    Writes module's structure and parameters to path. The parameters are a
+    single contiguous block of float64s, so saving and loading is one write
+    and one read (or one mmap) no matter how many Values the model has.
+    """
+    config = module._config()
+    config['type'] = type(module).__name__
+    buffer = module._buffer
+    if buffer is not None:
+        buffer.gather()
+    data = buffer.data if buffer is not None else array('d', [p.data for p in module.parameters()])
+    header = json.dumps({'version': VERSION, 'module': config, 'count': len(data)}).encode()
+    pad = -(len(MAGIC) + 4 + len(header)) % _ALIGN
+    header += b' ' * pad
+    if sys.byteorder != 'little':
+        data = array('d', data)
+        data.byteswap()
+    with open(path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(header)) + header)
+        f.write(memoryview(data).cast('B'))
+
+def _read_header(f):
+    prefix = f.read(len(MAGIC) + 4)
+    if prefix[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{f.name} is not a micrograd model file")
+    n, = struct.unpack('<I', prefix[len(MAGIC):])
+    header = json.loads(f.read(n))
+    if header['version'] != VERSION:
+        raise ValueError(f"unsupported model file version {header['version']}")
+    return header, len(prefix) + n
+
+def load(path, mmap=False):
+    """
+    Rebuilds the module saved at path. It comes back packed (see Module.pack),
+    built straight from the file: there is no random init, and the
+    ParameterBuffer's Parameters are only created when the module is first
+    trained (or its parameters() asked for). Until then, inference under
+    no_grad reads the weights directly from the buffer, so loading creates
+    one object per neuron rather than one per parameter.
+
+    With mmap=True the parameters are not even read: ParameterBuffer.data
+    becomes a float64 view of the file mapped copy-on-write, so pages are
+    only loaded as they are touched, the process shares them with any other
+    process serving the same file, and updating parameters works but never
+    writes to the file.
+    """
+    with open(path, 'rb') as f:
+        header, offset = _read_header(f)
+        config = dict(header['module'])
+        name = config.pop('type')
+        cls = getattr(nn, name, None)
+        if not (isinstance(cls, type) and issubclass(cls, nn.Module) and cls._config is not nn.Module._config):
+            raise ValueError(f"{path}: {name!r} is not a micrograd.nn module that can be loaded")
+        n = header['count']
+        if mmap and sys.byteorder == 'little' and n:
+            mapped = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_COPY)
+            data = memoryview(mapped)[offset:offset + 8 * n].cast('d')
+        else:
+            f.seek(offset)
+            data = array('d')
+            data.fromfile(f, n)
+            if sys.byteorder != 'little':
+                data.byteswap()
+    buffer = nn.ParameterBuffer._loaded(data)
+    with nn._loading_into(buffer) as loading:
+        module = cls(**config)
+    if loading.count != n:
+        raise ValueError(f"{path} has {n} parameters, but {cls.__name__}(**{config}) has {loading.count}")
+    buffer._module = module
+    module._buffer = buffer
+    return module
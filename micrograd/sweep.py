@@ -0,0 +1,163 @@
+import math
+import multiprocessing
+import random
+import statistics
+import time
+from array import array
+from multiprocessing import shared_memory
+from micrograd.engine import no_grad
+from micrograd.losses import svm_loss
+from micrograd.nn import MLP
+from micrograd.optim import SGD
+
+class SharedDataset:
+    """
+    A read-only dataset of n samples, X of shape (n, d) and y of shape (n,),
+    kept as float64 in one block of shared memory. Pickling it (e.g. to send
+    it to pool workers) only sends the block's name, and each process maps
+    the same memory instead of getting its own copy.
+    """
+
+    def __init__(self, X, y):
+        X = [list(map(float, row)) for row in X]
+        self.n, self.d = len(X), len(X[0])
+        self._shm = shared_memory.SharedMemory(create=True, size=8 * self.n * (self.d + 1))
+        self._owner = True
+        buf = self._view()
+        buf[:self.n * self.d] = array('d', [v for row in X for v in row])
+        buf[self.n * self.d:] = array('d', map(float, y))
+
+    def _view(self):
+        return self._shm.buf.cast('d')
+
+    def __getstate__(self):
+        return {'name': self._shm.name, 'n': self.n, 'd': self.d}
+
+    def __setstate__(self, state):
+        self.n, self.d = state['n'], state['d']
+        self._shm = shared_memory.SharedMemory(state['name'])
+        self._owner = False
+
+    def __len__(self):
+        return self.n
+
+    def batch(self, indices):
+        """ the samples at indices as (X, y) lists """
+        buf, d, off = self._view(), self.d, self.n * self.d
+        return [buf[i * d:(i + 1) * d].tolist() for i in indices], [buf[off + i] for i in indices]
+
+    def close(self):
+        """ unmaps the memory, and frees it if this is the process that created it """
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def train_mlp(config, data, report):
+    """
+    The default training run: an MLP(d, config['nouts']) trained with SGD on
+    the svm loss of demo.ipynb, with L2 regularization config['alpha'] and a
+    learning rate decaying linearly from config['lr'] to config['lr_end'].
+    Keys and defaults: nouts, steps=100, batch_size=0 (full batch), alpha=1e-4,
+    lr=1.0, lr_end=0.1, momentum=0.0, seed=0, eval_every=10.
+    """
+    rng = random.Random(config.get('seed', 0))
+    # MLP initializes from the global random module: seed it for this run, but leave
+    # the caller's random state as it was (see micrograd.serialize.load)
+    state = random.getstate()
+    random.seed(config.get('seed', 0))
+    model = MLP(data.d, config['nouts'])
+    random.setstate(state)
+    params = model.parameters()
+    steps, batch_size = config.get('steps', 100), config.get('batch_size', 0)
+    alpha, lr, lr_end = config.get('alpha', 1e-4), config.get('lr', 1.0), config.get('lr_end', 0.1)
+    eval_every = config.get('eval_every', 10)
+    opt = SGD(params, lr=lr, momentum=config.get('momentum', 0.0))
+
+    window, stopped, k = [], False, 0
+    for k in range(steps):
+        indices = rng.sample(range(len(data)), batch_size) if batch_size else range(len(data))
+        X, y = data.batch(indices)
+        loss = svm_loss([model(x) for x in X], y, params, alpha)
+        window.append(loss.data)
+        opt.zero_grad()
+        loss.backward()
+        opt.lr = lr + (lr_end - lr) * k / max(steps - 1, 1) # lr on the first step, lr_end on the last
+        opt.step()
+        if (k + 1) % eval_every == 0:
+            if not report(sum(window) / len(window)):
+                stopped = True
+                break
+            window = []
+
+    # final loss and accuracy on all of the data
+    X, y = data.batch(range(len(data)))
+    with no_grad():
+        scores = [model(x) for x in X]
+    loss = sum(max(0.0, 1 - yi * si) for yi, si in zip(y, scores)) / len(y)
+    accuracy = sum((yi > 0) == (si > 0) for yi, si in zip(y, scores)) / len(y)
+    return {'loss': loss, 'accuracy': accuracy, 'steps': k + 1, 'stopped': stopped}
+
+# per-process state of a pool worker, set once by _init_worker (see micrograd.parallel)
+_worker = {}
+
+def _init_worker(data, table, max_reports, grace, min_runs):
+    _worker.update(data=data, table=table, max_reports=max_reports, grace=grace, min_runs=min_runs)
+
+def _should_continue(run, j, metric):
+    # median stopping rule: after grace reports, stop a run whose metric at its j-th
+    # report is worse than the median of what the other runs reported at theirs
+    table, m = _worker['table'], _worker['max_reports']
+    if table is None or j >= m:
+        return True
+    with table.get_lock():
+        table[run * m + j] = metric
+        others = [table[r * m + j] for r in range(len(table) // m) if r != run]
+    others = [v for v in others if not math.isnan(v)]
+    if j < _worker['grace'] or len(others) < _worker['min_runs']:
+        return True
+    return metric <= statistics.median(others)
+
+def _run(args):
+    run, config, train_fn = args
+    history = []
+    def report(metric):
+        history.append(metric)
+        return _should_continue(run, len(history) - 1, metric)
+    t0 = time.perf_counter()
+    result = train_fn(config, _worker['data'], report)
+    return run, dict(result, config=config, history=history, time=time.perf_counter() - t0)
+
+def sweep(configs, X, y, train_fn=train_mlp, processes=None, early_stopping=True,
+          grace=2, min_runs=3, max_reports=1000):
+    """
+    Runs train_fn(config, data, report) for every config across a pool of
+    processes and returns one result per config, in order: train_fn's
+    returned dict plus the config, the history of reported metrics and the
+    run's wall time.
+
+    X and y are put in a SharedDataset once and shared by all workers.
+    train_fn (a module level function, so it can be pickled; train_mlp by
+    default) calls report(metric) every so often with a lower-is-better
+    metric and stops when it returns False. With early_stopping, report
+    returns False once a run is past grace reports and worse than the
+    median of at least min_runs other runs at the same report, so poor runs
+    free their core for the next config.
+    """
+    configs = list(configs)
+    processes = min(processes or multiprocessing.cpu_count(), len(configs))
+    # every run's reported metrics, max_reports slots per run, NaN until reported
+    table = multiprocessing.Array('d', [math.nan] * (len(configs) * max_reports)) if early_stopping else None
+    with SharedDataset(X, y) as data:
+        with multiprocessing.Pool(processes, _init_worker, (data, table, max_reports, grace, min_runs)) as pool:
+            results = [None] * len(configs)
+            jobs = [(i, config, train_fn) for i, config in enumerate(configs)]
+            # unordered and one run at a time, so a worker picks up the next config as soon as it's free
+            for run, result in pool.imap_unordered(_run, jobs, chunksize=1):
+                results[run] = result
+    return results
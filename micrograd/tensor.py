@@ -0,0 +1,197 @@
+from micrograd.engine import is_grad_enabled
+
+try:
+    import numpy as np
+except ImportError: # numpy is only needed for Tensor, the scalar engine works without it
+    np = None
+
+def _unbroadcast(grad, shape):
+    # sum grad back down to shape, undoing numpy broadcasting in the forward pass
+    while grad.ndim > len(shape):
+        grad = grad.sum(axis=0)
+    for i, n in enumerate(shape):
+        if n == 1 and grad.shape[i] != 1:
+            grad = grad.sum(axis=i, keepdims=True)
+    return grad
+
+def _freed_backward():
+    raise RuntimeError("trying to backward through a part of the graph that was already freed, "
+                       "use retain_graph=True on the first backward()")
+
+class Tensor:
+    """
+    The array counterpart of Value: stores a numpy array and its gradient,
+    and builds the same kind of graph, with one node per array operation
+    instead of one per scalar. backward() has the same semantics as
+    Value.backward() (including retain_graph, but not create_graph), so a
+    Tensor computation gives the same gradients as the equivalent scalar one.
+    """
+
+    # make numpy defer to our reflected operators, so ndarray @ Tensor builds a Tensor
+    __array_ufunc__ = None
+
+    def __init__(self, data, _children=(), _op=''):
+        if np is None:
+            raise ImportError("Tensor requires numpy")
+        self.data = np.asarray(data, dtype=np.float64)
+        self.grad = np.zeros_like(self.data)
+        self._backward = lambda: None
+        self._prev = tuple(_children) if is_grad_enabled() else () # see micrograd.engine.no_grad
+        self._op = _op
+
+    @classmethod
+    def from_values(cls, values, shape):
+        """
+        Packs a flat list of scalar Values into a Tensor of the given shape.
+        Gradients flowing into the Tensor are added back to each Value's .grad,
+        so scalar parameters can take part in a vectorized computation.
+        """
+        out = cls([v.data for v in values])
+        out.data = out.data.reshape(shape)
+        out.grad = np.zeros_like(out.data)
+        out._op = 'values'
+
+        def _backward():
+            for v, g in zip(values, out.grad.ravel().tolist()):
+                v.grad += g
+        out._backward = _backward
+
+        return out
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __add__(self, other):
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        out = Tensor(self.data + other.data, (self, other), '+')
+
+        def _backward():
+            self.grad += _unbroadcast(out.grad, self.shape)
+            other.grad += _unbroadcast(out.grad, other.shape)
+        out._backward = _backward
+
+        return out
+
+    def __mul__(self, other):
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        out = Tensor(self.data * other.data, (self, other), '*')
+
+        def _backward():
+            self.grad += _unbroadcast(other.data * out.grad, self.shape)
+            other.grad += _unbroadcast(self.data * out.grad, other.shape)
+        out._backward = _backward
+
+        return out
+
+    def __matmul__(self, other):
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        out = Tensor(self.data @ other.data, (self, other), '@')
+
+        def _backward():
+            # treat 1-D operands as a row (left) / column (right) vector
+            a = self.data.reshape(1, -1) if self.data.ndim == 1 else self.data
+            b = other.data.reshape(-1, 1) if other.data.ndim == 1 else other.data
+            g = out.grad.reshape(a.shape[0], b.shape[1])
+            self.grad += (g @ b.T).reshape(self.shape)
+            other.grad += (a.T @ g).reshape(other.shape)
+        out._backward = _backward
+
+        return out
+
+    def __pow__(self, other):
+        assert isinstance(other, (int, float)), "only supporting int/float powers for now"
+        out = Tensor(self.data**other, (self,), f'**{other}')
+
+        def _backward():
+            self.grad += (other * self.data**(other-1)) * out.grad
+        out._backward = _backward
+
+        return out
+
+    def relu(self):
+        out = Tensor(np.maximum(self.data, 0), (self,), 'ReLU')
+
+        def _backward():
+            self.grad += (out.data > 0) * out.grad
+        out._backward = _backward
+
+        return out
+
+    def sum(self, axis=None, keepdims=False):
+        out = Tensor(self.data.sum(axis=axis, keepdims=keepdims), (self,), 'sum')
+
+        def _backward():
+            g = out.grad
+            if axis is not None and not keepdims:
+                g = np.expand_dims(g, axis)
+            self.grad += np.broadcast_to(g, self.shape)
+        out._backward = _backward
+
+        return out
+
+    def mean(self, axis=None, keepdims=False):
+        n = self.data.size if axis is None else np.prod([self.shape[a] for a in np.atleast_1d(axis)])
+        return self.sum(axis=axis, keepdims=keepdims) * (1.0 / n)
+
+    def _build_topo(self):
+        # same explicit-stack traversal as Value._build_topo
+        topo = []
+        visited = set()
+        stack = [(self, False)]
+        while stack:
+            v, expanded = stack.pop()
+            if expanded:
+                topo.append(v)
+            elif v not in visited:
+                visited.add(v)
+                stack.append((v, True))
+                for child in reversed(v._prev):
+                    if child not in visited:
+                        stack.append((child, False))
+        return topo
+
+    def backward(self, retain_graph=False):
+
+        topo = self._build_topo()
+
+        # interior nodes (and from_values nodes, which pass their gradient on to
+        # Values) start from zero, like in Value.backward; leaves keep accumulating
+        for v in topo:
+            if v._prev or v._op == 'values':
+                v.grad = np.zeros_like(v.data)
+
+        # seeding with ones makes a non-scalar output behave like its sum
+        self.grad = np.ones_like(self.data)
+        for v in reversed(topo):
+            v._backward()
+            if not retain_graph and (v._prev or v._op == 'values'):
+                # release the node's edges (and its closure), see Value.backward
+                v._prev, v._op, v._backward = (), 'freed', _freed_backward
+
+    def __neg__(self): # -self
+        return self * -1
+
+    def __radd__(self, other): # other + self
+        return self + other
+
+    def __sub__(self, other): # self - other
+        return self + (-other)
+
+    def __rsub__(self, other): # other - self
+        return other + (-self)
+
+    def __rmul__(self, other): # other * self
+        return self * other
+
+    def __rmatmul__(self, other): # other @ self
+        return Tensor(other) @ self
+
+    def __truediv__(self, other): # self / other
+        return self * other**-1
+
+    def __rtruediv__(self, other): # other / self
+        return other * self**-1
+
+    def __repr__(self):
+        return f"Tensor(data={self.data}, grad={self.grad})"
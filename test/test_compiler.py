@@ -0,0 +1,73 @@
+import random
+from micrograd.engine import Value, dot, logsumexp, softmax, sum
+from micrograd.nn import MLP
+from micrograd.compiler import compile
+
+def test_compiled_matches_backward():
+
+    def f(a, b):
+        c = a + b
+        d = a * b + b**3
+        c += c + 1
+        c += 1 + c + (-a)
+        d += d * 2 + (b + a).relu()
+        d += 3 * d + (b - a).relu()
+        e = c - d
+        f = e**2
+        g = f / 2.0
+        g += 10.0 / f
+        return g
+
+    cf = compile(f)
+    for xa, xb in [(-4.0, 2.0), (1.5, -0.5), (0.25, 3.0)]:
+        a, b = Value(xa), Value(xb)
+        g = f(a, b)
+        g.backward()
+        out, (ga, gb) = cf(xa, xb)
+        assert out == g.data
+        assert (ga, gb) == (a.grad, b.grad)
+
+def test_compiled_mlp_accumulates_parameter_grads():
+
+    random.seed(0)
+    model = MLP(2, [4, 4, 1])
+    cf = compile(lambda x0, x1: model([x0, x1]))
+    for x in [[0.5, -1.0], [1.0, 2.0]]:
+        model.zero_grad()
+        out = model(x)
+        out.backward()
+        ref = [p.grad for p in model.parameters()]
+        model.zero_grad()
+        data, _ = cf(*x)
+        assert data == out.data
+        assert [p.grad for p in model.parameters()] == ref
+
+def test_compiled_transcendental_ops():
+
+    def f(a, b):
+        p = softmax([a, b, a * b])
+        return logsumexp([a.exp(), b.log(), p[2]]) + a.tanh() * b.sigmoid() + p[0]
+
+    cf = compile(f)
+    for xa, xb in [(0.5, 1.5), (-1.0, 0.25)]:
+        a, b = Value(xa), Value(xb)
+        y = f(a, b)
+        y.backward()
+        out, grads = cf(xa, xb)
+        assert out == y.data
+        assert grads == [a.grad, b.grad]
+
+def test_compiled_wide_inputs():
+
+    # n-ary nodes with thousands of children compile without hitting the parser's recursion limit
+    n = 5000
+    random.seed(0)
+    ws = [Value(random.uniform(-1, 1)) for _ in range(n)]
+    xs = [random.uniform(-1, 1) for _ in range(n)]
+    for f in (lambda *xs: dot(ws, xs), lambda *xs: sum(xs)):
+        vs = [Value(x) for x in xs]
+        y = f(*vs)
+        y.backward()
+        out, grads = compile(f)(*xs)
+        assert out == y.data
+        assert grads == [v.grad for v in vs]
@@ -0,0 +1,55 @@
+import random
+import pytest
+from micrograd.data import CSVSource, NPYSource, DataLoader, shuffle, batch, prefetch
+
+def test_sources(tmp_path):
+
+    np = pytest.importorskip('numpy')
+    X = np.random.RandomState(0).uniform(-1, 1, (10, 3))
+    y = np.arange(10) % 2
+
+    path = tmp_path / 'data.csv'
+    path.write_text('a,b,label,c\n' + ''.join(f'{r[0]!r},{r[1]!r},{t},{r[2]!r}\n' for r, t in zip(X.tolist(), y)))
+    samples = list(CSVSource(str(path), target=2, header=True))
+    assert samples == [(r, float(t)) for r, t in zip(X.tolist(), y)]
+
+    np.save(tmp_path / 'x.npy', X)
+    np.save(tmp_path / 'y.npy', y.astype('>i4')) # big-endian, to exercise the byte swap
+    np.save(tmp_path / 'x3.npy', X.reshape(10, 3, 1).astype(np.float32))
+    samples = list(NPYSource(str(tmp_path / 'x.npy'), str(tmp_path / 'y.npy'), chunk=3))
+    assert samples == list(zip(X.tolist(), y.tolist()))
+    rows = [x for x, _ in NPYSource(str(tmp_path / 'x3.npy'), chunk=4)]
+    assert rows == X.astype(np.float32).tolist()
+
+def test_pipeline():
+    data = [([i], i) for i in range(103)]
+
+    # the shuffle buffer is a permutation, and a seeded loader is reproducible
+    out = list(shuffle(iter(data), 10, random.Random(0)))
+    assert sorted(out) == data and out != data
+    assert [b for _, b in batch(data, 25)][-1] == [100, 101, 102]
+    assert len(list(batch(data, 25, drop_last=True))) == 4
+
+    loader = DataLoader(data, batch_size=16, shuffle_buffer=32, seed=1)
+    epoch1 = [y for _, y in loader]
+    epoch2 = [y for _, y in loader]
+    assert sorted(sum(epoch1, [])) == list(range(103)) and epoch1 != epoch2
+    assert [y for _, y in DataLoader(data, 16, shuffle_buffer=32, seed=1)] == epoch1
+    assert [y for _, y in DataLoader(data, 16, prefetch=0)] == [y for _, y in DataLoader(data, 16)]
+
+def test_prefetch_errors_and_close():
+    def broken():
+        yield 1
+        raise ValueError("bad row")
+    it = prefetch(broken())
+    assert next(it) == 1
+    try:
+        next(it)
+        assert False
+    except ValueError as e:
+        assert str(e) == "bad row"
+
+    with prefetch(iter(range(10**6)), depth=2) as it:
+        assert next(it) == 0
+    assert not it._thread.is_alive()
+    assert list(it) == [] # closed: stops right away rather than blocking on the empty queue
@@ -0,0 +1,59 @@
+import random
+from micrograd import engine
+from micrograd.engine import Value
+from micrograd.nn import MLP
+from micrograd.dual import Dual, jvp
+
+def test_ops_match_reverse_mode():
+
+    def f(a, b):
+        c = a * b + b**3
+        d = (c - a).relu() + c / 2.0 + a.exp() * b.tanh()
+        return d * d - 1.5 / c + (a * a).log() - b.sigmoid()
+
+    a, b = Value(1.5), Value(-0.5)
+    y = f(a, b)
+    y.backward()
+    ya = f(Dual(1.5, 1.0), Dual(-0.5, 0.0))
+    yb = f(Dual(1.5, 0.0), Dual(-0.5, 1.0))
+    assert ya.data == y.data
+    assert abs(ya.tangent - a.grad) < 1e-12
+    assert abs(yb.tangent - b.grad) < 1e-12
+
+def test_jvp_mlp_jacobian():
+
+    random.seed(0)
+    model = MLP(2, [8, 8, 5])
+    x = [0.3, -0.2]
+    cols = [jvp(model, x, t)[1] for t in ([1.0, 0.0], [0.0, 1.0])]
+    for i in range(5):
+        model.zero_grad()
+        inputs = [Value(xi) for xi in x]
+        model(inputs)[i].backward()
+        for j in range(2):
+            assert abs(cols[j][i] - inputs[j].grad) < 1e-12
+
+def test_nary_ops():
+
+    # the n-ary engine ops compute on Duals directly instead of wrapping them in nodes
+    fs = [
+        lambda v: engine.dot(v, [2.0, 3.0]) + engine.sum([v[0], v[1], 1.0]),
+        lambda v: engine.logsumexp([v[0], v[1], 0.5]),
+        lambda v: engine.softmax([v[0], v[1]])[1] * engine.softmax([v[1], 2.0])[0],
+    ]
+    x = [0.7, -1.3]
+    for f in fs:
+        xs = [Value(v) for v in x]
+        y = f(xs)
+        y.backward()
+        for j, t in enumerate(([1.0, 0.0], [0.0, 1.0])):
+            out, tangent = jvp(f, x, t)
+            assert abs(out - y.data) < 1e-12
+            assert abs(tangent - xs[j].grad) < 1e-12
+
+    # an output that lost its tangent is an error, not a zero
+    try:
+        jvp(lambda v: Value(2.0) * v[0], [1.0], [1.0])
+        assert False, "expected TypeError"
+    except TypeError:
+        pass
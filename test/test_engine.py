@@ -1,5 +1,10 @@
 import torch
-from micrograd.engine import Value
+from micrograd.engine import Value, Plan, no_grad, dot, checkpoint, grad, hvp, jacobian, logsumexp, softmax
+import math
+import os
+import subprocess
+import sys
+from micrograd import engine
 
 def test_sanity_check():
 
@@ -65,3 +70,239 @@ def test_more_ops():
     # backward pass went well
     assert abs(amg.grad - apt.grad.item()) < tol
     assert abs(bmg.grad - bpt.grad.item()) < tol
+
+def test_deep_graph():
+
+    # deeper than the default recursion limit
+    x = Value(1.0)
+    y = x
+    for _ in range(10000):
+        y = y + x
+    y.backward()
+    assert y.data == 10001.0
+    assert x.grad == 10001.0
+
+def test_plan_replay():
+
+    def f(a, b):
+        c = a * b + b**3
+        return (c - a).relu() + c / 2.0
+
+    a, b = Value(0.0), Value(0.0)
+    plan = Plan(f(a, b), [a, b])
+    for xa, xb in [(-4.0, 2.0), (1.5, -0.5), (3.0, 3.0)]:
+        out = plan.forward([xa, xb])
+        a.grad = b.grad = 0
+        plan.backward()
+
+        ra, rb = Value(xa), Value(xb)
+        ref = f(ra, rb)
+        ref.backward()
+        assert out == ref.data
+        assert (a.grad, b.grad) == (ra.grad, rb.grad)
+
+def test_no_grad():
+
+    a = Value(2.0)
+    with no_grad():
+        b = (a * 3 + 1).relu()
+    assert b.data == 7.0
+    assert b._prev == () and b._op == ''
+    c = a * 3
+    assert c._prev == (a, c._prev[1])
+
+def test_sum_and_dot():
+
+    def chained():
+        ws = [Value(w) for w in (0.5, -1.5, 2.0)]
+        xs = [Value(x) for x in (3.0, 1.0, -2.0)]
+        return ws, xs
+
+    ws, xs = chained()
+    y = sum((w*x for w, x in zip(ws, xs)), Value(0.0))
+    y = (y + sum(xs, Value(0.0))) * ws[0]
+    y.backward()
+
+    ws2, xs2 = chained()
+    y2 = (dot(ws2, xs2) + engine.sum(xs2)) * ws2[0]
+    assert len(y2._build_topo()) == 10
+    y2.backward()
+    assert y2.data == y.data
+    assert [v.grad for v in ws2 + xs2] == [v.grad for v in ws + xs]
+
+def test_checkpoint():
+
+    def block(xs):
+        a, b = xs
+        c = a * b + b**3
+        return [(c - a).relu(), c * 2.0]
+
+    a, b = Value(1.5), Value(-0.5)
+    c, d = block([a, b])
+    e = c * d + d
+    a2, b2 = Value(1.5), Value(-0.5)
+    c2, d2 = checkpoint(block, [a2, b2])
+    e2 = c2 * d2 + d2
+    assert len(e2._build_topo()) < len(e._build_topo())
+    e.backward()
+    e2.backward()
+    assert (c2.data, d2.data) == (c.data, d.data)
+    assert abs(a2.grad - a.grad) < 1e-12
+    assert abs(b2.grad - b.grad) < 1e-12
+
+def test_retain_graph():
+
+    a = Value(2.0)
+    b = a * a + 1
+    b.backward(retain_graph=True)
+    assert a.grad == 4.0
+    b.backward(retain_graph=True)
+    assert a.grad == 8.0
+
+    # by default the edges are released as the backward pass goes
+    b.backward()
+    assert a.grad == 12.0
+    assert b._prev == ()
+
+    # backpropagating again into a freed part of the graph raises, rather than
+    # treating the freed node as a leaf
+    a = Value(2.0)
+    b = a * a
+    c, d = b + 1, b * 3
+    c.backward()
+    assert a.grad == 4.0
+    try:
+        d.backward()
+        assert False, "expected RuntimeError"
+    except RuntimeError as e:
+        assert 'retain_graph=True' in str(e)
+    a = Value(2.0)
+    b = a * a
+    c, d = b + 1, b * 3
+    c.backward(retain_graph=True)
+    d.backward()
+    assert a.grad == 16.0
+
+    # a Plan over a freed graph raises too, instead of replaying stale data
+    a = Value(0.0)
+    out = a * a + 1
+    plan = Plan(out, [a])
+    assert plan.forward([3.0]) == 10.0
+    out.backward()
+    try:
+        plan.forward([5.0])
+        assert False, "expected RuntimeError"
+    except RuntimeError as e:
+        assert 'retain_graph=True' in str(e)
+
+def test_higher_order():
+
+    x, y = Value(1.5), Value(-2.0)
+    f = x**3 * y + dot([x, y], [y, y]) + (x * y).relu()
+    # df/dx = 3x^2 y + y, df/dy = x^3 + x + 2y, d2f/dx2 = 6xy, d2f/dxdy = 3x^2 + 1, d2f/dy2 = 2
+    gx, gy = grad(f, [x, y], create_graph=True)
+    assert abs(gx.data - (3 * 1.5**2 * -2.0 - 2.0)) < 1e-12
+    assert abs(gy.data - (1.5**3 + 1.5 - 4.0)) < 1e-12
+    assert grad(gx, [x, y]) == [6 * 1.5 * -2.0, 3 * 1.5**2 + 1]
+
+    Hv = hvp(f, [x, y], [1.0, 2.0])
+    assert abs(Hv[0] - (6 * 1.5 * -2.0 + 2 * (3 * 1.5**2 + 1))) < 1e-12
+    assert abs(Hv[1] - ((3 * 1.5**2 + 1) + 2 * 2)) < 1e-12
+
+    f.backward(create_graph=True)
+    assert isinstance(x.grad, Value) and x.grad.data == gx.data
+    x.grad.backward()
+    assert y.grad.data == gy.data + 3 * 1.5**2 + 1
+
+def test_jacobian():
+
+    def f(xs):
+        a, b, c = xs
+        d = a * b + c**2
+        return [d.relu(), d * a, dot([a, b], [c, c]) - 1.0, b / c]
+
+    x = [1.5, -0.5, 2.0]
+    J = jacobian(f, x)
+    assert len(J) == 4 and all(len(row) == 3 for row in J)
+    for i in range(4):
+        xs = [Value(v) for v in x]
+        f(xs)[i].backward()
+        for j in range(3):
+            assert abs(J[i][j] - xs[j].grad) < 1e-12
+
+def test_transcendental_ops():
+
+    def numeric(f, xs, i, h=1e-6):
+        up = [x + h if j == i else x for j, x in enumerate(xs)]
+        down = [x - h if j == i else x for j, x in enumerate(xs)]
+        return (f([Value(x) for x in up]).data - f([Value(x) for x in down]).data) / (2 * h)
+
+    fs = [
+        lambda v: v[0].exp() * v[1].log(),
+        lambda v: v[0].tanh() + v[1].sigmoid() * v[0],
+        lambda v: logsumexp([v[0], v[1], v[0] * v[1]]),
+        lambda v: softmax([v[0], v[1], 0.5])[1] * 3 + softmax([v[1], v[0]])[0],
+    ]
+    x = [0.7, 1.3]
+    for f in fs:
+        xs = [Value(v) for v in x]
+        f(xs).backward()
+        for i in range(2):
+            assert abs(xs[i].grad - numeric(f, x, i)) < 1e-6
+        # second derivatives agree with differentiating the first ones numerically
+        g = lambda v, f=f: grad(f(v), v, create_graph=True)[0]
+        xs = [Value(v) for v in x]
+        assert abs(grad(g(xs), xs)[1] - numeric(g, x, 1)) < 1e-5
+
+def test_stable_kernels():
+
+    assert Value(-1000.0).sigmoid().data == 0.0
+    assert Value(1000.0).sigmoid().data == 1.0
+    xs = [Value(1000.0), Value(1000.0)]
+    lse = logsumexp(xs)
+    assert abs(lse.data - (1000.0 + math.log(2))) < 1e-9
+    lse.backward()
+    assert xs[0].grad == xs[1].grad == 0.5
+    assert [p.data for p in softmax([Value(-1000.0), Value(1000.0)])] == [0.0, 1.0]
+
+def test_deterministic_order():
+
+    a, b = Value(1.0), Value(2.0)
+    c = a * b
+    d = (c + a).relu() + dot([c, b], [a, c])
+
+    # same order as the classic recursive traversal: children first to last
+    topo, visited = [], set()
+    def build_topo(v):
+        if v not in visited:
+            visited.add(v)
+            for child in v._prev:
+                build_topo(child)
+            topo.append(v)
+    build_topo(d)
+    assert d._build_topo() == topo
+
+    # Values hash by id, so anything that iterated over a set or dict of nodes would
+    # depend on where they happen to be allocated. Fresh interpreters that allocate
+    # a different number of objects first put the model at different addresses
+    # (the first line shows that a set of its parameters really comes out in a
+    # different order), and still get bitwise identical gradients
+    script = (
+        "import random, sys\n"
+        "padding = [[] for _ in range(int(sys.argv[1]))]\n"
+        "from micrograd.nn import MLP\n"
+        "random.seed(0)\n"
+        "model = MLP(3, [16, 16, 1])\n"
+        "params = model.parameters()\n"
+        "index = {p: i for i, p in enumerate(params)}\n"
+        "print([index[p] for p in set(params)])\n"
+        "loss = sum((model([0.1 * i, -0.2 * i, 0.3]) - i % 2)**2 for i in range(8))\n"
+        "loss.backward()\n"
+        "print([p.grad.hex() for p in params])\n"
+    )
+    root = os.path.join(os.path.dirname(__file__), '..')
+    runs = [subprocess.run([sys.executable, '-c', script, padding], capture_output=True, text=True, check=True,
+                           cwd=root).stdout.splitlines()
+            for padding in ('0', '1000', '3333')]
+    assert len({orders for orders, _ in runs}) > 1
+    assert runs[0][1] == runs[1][1] == runs[2][1]
@@ -0,0 +1,97 @@
+import random
+import pytest
+from micrograd.engine import Value, Plan, logsumexp, hvp
+from micrograd.nn import MLP
+from micrograd.losses import svm_loss, mse_loss, cross_entropy
+
+def check(fused_fn, composed_fn, nparams):
+    random.seed(0)
+    model = MLP(2, [4, nparams])
+    X = [[random.uniform(-1, 1), random.uniform(-1, 1)] for _ in range(6)]
+
+    loss = composed_fn(model, X)
+    loss.backward()
+    ref = [p.grad for p in model.parameters()]
+    model.zero_grad()
+    fused = fused_fn(model, X)
+    assert abs(fused.data - loss.data) < 1e-12
+    fused.backward()
+    for g, p in zip(ref, model.parameters()):
+        assert abs(g - p.grad) < 1e-12
+
+def test_svm_loss():
+
+    y = [1.0, -1.0, 1.0, 1.0, -1.0, -1.0]
+    def composed(model, X):
+        scores = [model(x) for x in X]
+        losses = [(1 + -yi*si).relu() for yi, si in zip(y, scores)]
+        return sum(losses) * (1.0 / len(losses)) + 1e-2 * sum((p*p for p in model.parameters()))
+    def fused(model, X):
+        return svm_loss([model(x) for x in X], y, model.parameters(), alpha=1e-2)
+    check(fused, composed, 1)
+
+def test_mse_loss():
+
+    t = [0.5, -1.0, 2.0, 0.0, 1.0, -0.5]
+    def composed(model, X):
+        return sum(((model(x) - ti)**2 for x, ti in zip(X, t))) * (1.0 / len(t))
+    def fused(model, X):
+        return mse_loss([model(x) for x in X], t)
+    check(fused, composed, 1)
+
+def test_cross_entropy():
+
+    t = [0, 2, 1, 1, 0, 2]
+    def composed(model, X):
+        rows = [model(x) for x in X]
+        return sum((logsumexp(row) - row[ti] for row, ti in zip(rows, t))) * (1.0 / len(t))
+    def fused(model, X):
+        return cross_entropy([model(x) for x in X], t)
+    check(fused, composed, 3)
+
+def test_fused_losses_replay_and_second_order():
+
+    a, b = Value(0.3), Value(-1.2)
+    plan = Plan(mse_loss([a * b, a + b], [1.0, 0.0]) + cross_entropy([[a, b]], [1]), [a, b])
+    for x in [(0.3, -1.2), (2.0, 0.5)]:
+        out = plan.forward(x)
+        ra, rb = Value(x[0]), Value(x[1])
+        ref = ((ra * rb - 1.0)**2 + (ra + rb)**2) * 0.5 + logsumexp([ra, rb]) - rb
+        assert abs(out - ref.data) < 1e-12
+
+    ra, rb = Value(0.3), Value(-1.2)
+    ref = ((ra * rb - 1.0)**2 + (ra + rb)**2) * 0.5 + logsumexp([ra, rb]) - rb
+    fused = mse_loss([ra * rb, ra + rb], [1.0, 0.0]) + cross_entropy([[ra, rb]], [1])
+    for u, v in zip(hvp(fused, [ra, rb], [1.0, -1.0]), hvp(ref, [ra, rb], [1.0, -1.0])):
+        assert abs(u - v) < 1e-12
+
+def test_targets():
+
+    # targets can be Values: they are children of the loss node and get their gradient
+    a, t = Value(1.5), Value(0.5)
+    loss = mse_loss([a * 2], [t])
+    assert loss.data == 6.25
+    loss.backward()
+    assert (a.grad, t.grad) == (10.0, -5.0)
+    s, y = Value(0.25), Value(-1.0)
+    loss = svm_loss([s * 1.0], [y])
+    assert loss.data == 1.25
+    loss.backward()
+    assert (s.grad, y.grad) == (1.0, -0.25)
+
+    # so a Plan built on placeholder targets replays the loss with new ones
+    a, b, y, t = Value(0.0), Value(0.0), Value(0.0), Value(0.0)
+    plan = Plan(svm_loss([a, b], [y, 1.0]) + cross_entropy([[a, b]], [t]), [a, b, y, t])
+    for xa, xb, xy, xt in [(0.3, -1.2, 1.0, 0), (2.0, 0.5, -1.0, 1)]:
+        out = plan.forward([xa, xb, xy, xt])
+        ra, rb = Value(xa), Value(xb)
+        ref = svm_loss([ra, rb], [xy, 1.0]) + cross_entropy([[ra, rb]], [xt])
+        assert out == ref.data
+
+    # anything else is refused up front
+    with pytest.raises(TypeError, match='numbers or Values'):
+        mse_loss([a], ['0.5x'])
+    with pytest.raises(ValueError, match='1 outputs but 2 targets'):
+        svm_loss([a], [1.0, -1.0])
+    with pytest.raises(ValueError, match='class index'):
+        cross_entropy([[a, b]], [2])
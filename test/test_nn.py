@@ -0,0 +1,150 @@
+import random
+import pytest
+from micrograd.engine import Value, no_grad, grad
+from micrograd.nn import MLP
+
+def svm_loss(model, X, y):
+    scores = [model(xi) for xi in X]
+    losses = [(1 + -yi*si).relu() for yi, si in zip(y, scores)]
+    return sum(losses) * (1.0 / len(losses))
+
+def test_plan_matches_rebuild():
+
+    random.seed(0)
+    model = MLP(2, [4, 4, 1])
+    X = [[random.uniform(-1, 1), random.uniform(-1, 1)] for _ in range(5)]
+    y = [random.choice([-1.0, 1.0]) for _ in range(5)]
+
+    def loss_fn(inputs):
+        Xv = [inputs[2*i:2*i+2] for i in range(5)]
+        return svm_loss(model, Xv, inputs[10:])
+
+    plan = model.plan(loss_fn, 15)
+    data = [v for xi in X for v in xi] + y
+    out = plan.forward(data)
+    model.zero_grad()
+    plan.backward()
+    grads = [p.grad for p in model.parameters()]
+
+    model.zero_grad()
+    ref = svm_loss(model, X, y)
+    ref.backward()
+    assert abs(out - ref.data) < 1e-12
+    for g, p in zip(grads, model.parameters()):
+        assert abs(g - p.grad) < 1e-12
+
+    # the plan is reused until the structure changes
+    assert model.plan(loss_fn, 15) is plan
+    assert model.plan(loss_fn, 15) is plan
+    model.layers[-1].neurons[0].b = Value(0)
+    assert model.plan(loss_fn, 15) is not plan
+
+    # or the loss changes
+    plan = model.plan(loss_fn, 15)
+    scaled = lambda inputs: loss_fn(inputs) * 100
+    other = model.plan(scaled, 15)
+    assert other is not plan
+    assert abs(other.forward(data) - 100 * plan.forward(data)) < 1e-9
+
+    # or its graph was freed by a plain backward()
+    other.output.backward()
+    assert model.plan(scaled, 15) is not other
+
+def test_batched_forward_matches_per_sample():
+
+    np = pytest.importorskip('numpy')
+    from micrograd.tensor import Tensor
+
+    random.seed(1)
+    model = MLP(2, [4, 4, 1])
+    X = np.array([[random.uniform(-1, 1), random.uniform(-1, 1)] for _ in range(6)])
+    y = np.array([random.choice([-1.0, 1.0]) for _ in range(6)])
+
+    ref = svm_loss(model, X.tolist(), y.tolist())
+    ref.backward()
+    grads = [p.grad for p in model.parameters()]
+
+    model.zero_grad()
+    scores = model(X)
+    assert scores.shape == (6, 1)
+    loss = (1 + -Tensor(y[:, None]) * scores).relu().mean()
+    loss.backward()
+    assert abs(loss.data - ref.data) < 1e-12
+    for g, p in zip(grads, model.parameters()):
+        assert abs(g - p.grad) < 1e-12
+
+def test_pack():
+
+    random.seed(2)
+    model = MLP(2, [4, 4, 1])
+    X = [[0.5, -1.0], [1.0, 2.0]]
+    y = [1.0, -1.0]
+    ref = svm_loss(model, X, y)
+    ref.backward()
+    grads = [p.grad for p in model.parameters()]
+    data = [p.data for p in model.parameters()]
+
+    buffer = model.pack()
+    assert list(buffer.data) == data
+    assert list(buffer.grad) == grads
+    model.zero_grad()
+    assert not any(buffer.grad)
+
+    loss = svm_loss(model, X, y)
+    loss.backward()
+    assert loss.data == ref.data
+    assert [p.grad for p in model.parameters()] == grads
+    buffer.gather()
+    assert list(buffer.grad) == grads
+
+    # the arrays are synced in bulk: gather() copies the parameters in, scatter() copies them back
+    model.layers[0].neurons[0].w[0].data = 3.0
+    buffer.gather()
+    assert buffer.data[0] == 3.0
+    buffer.data[1] = -3.0
+    buffer.scatter()
+    assert model.layers[0].neurons[0].w[1].data == -3.0
+
+    # the parameters are plain Values, so create_graph works on them like on any leaf
+    x = Value(0.5)
+    out = model([x, 1.0])
+    gs = grad(out, model.parameters(), create_graph=True)
+    model.zero_grad()
+    out.backward(create_graph=True)
+    assert [p.grad.data for p in model.parameters()] == [g.data for g in gs]
+
+def test_no_grad_inference():
+
+    np = pytest.importorskip('numpy')
+
+    random.seed(3)
+    model = MLP(2, [4, 4, 1])
+    X = [[0.5, -1.0], [1.0, 2.0], [-0.3, 0.1]]
+    ref = [model(x).data for x in X]
+    with no_grad():
+        out = [model(x) for x in X]
+        batched = model(np.array(X))
+    assert out == ref
+    assert isinstance(batched, np.ndarray) and batched.shape == (3, 1)
+    assert np.allclose(batched[:, 0], ref, rtol=0, atol=1e-12)
+
+def test_checkpointed_mlp():
+
+    random.seed(4)
+    model = MLP(3, [5, 5, 5, 1])
+    ckpt = MLP(3, [5, 5, 5, 1], checkpoint_every=2)
+    for p, q in zip(model.parameters(), ckpt.parameters()):
+        q.data = p.data
+    X = [[0.1, -0.5, 2.0], [1.0, 1.0, -1.0]]
+    y = [1.0, -1.0]
+    ref = svm_loss(model, X, y)
+    ref.backward()
+    loss = svm_loss(ckpt, X, y)
+    loss.backward()
+    assert loss.data == ref.data
+    for p, q in zip(model.parameters(), ckpt.parameters()):
+        assert abs(p.grad - q.grad) < 1e-12
+
+    loss = svm_loss(ckpt, X, y)
+    with pytest.raises(NotImplementedError, match='checkpoint'):
+        loss.backward(create_graph=True)
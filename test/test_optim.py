@@ -0,0 +1,62 @@
+import random
+from micrograd.engine import Value
+from micrograd.nn import MLP
+from micrograd.optim import SGD, Adam, AdamW
+
+def quadratic(params):
+    # minimum at p_i = i
+    return sum(((p - i)**2 for i, p in enumerate(params)), Value(0))
+
+def test_sgd_matches_manual_update():
+
+    random.seed(0)
+    model = MLP(2, [4, 1])
+    ref = [p.data for p in model.parameters()]
+    loss = model([1.0, -2.0])
+    loss.backward()
+    opt = SGD(model.parameters(), lr=0.1)
+    opt.step()
+    for r, p in zip(ref, model.parameters()):
+        assert p.data == r - 0.1 * p.grad
+
+def test_momentum():
+
+    p = Value(1.0)
+    opt = SGD([p], lr=0.1, momentum=0.9)
+    for _ in range(2):
+        p.grad = 1.0
+        opt.step()
+    # v1 = 1, v2 = 0.9 * 1 + 1
+    assert abs(p.data - (1.0 - 0.1 * 1 - 0.1 * 1.9)) < 1e-12
+
+def test_optimizers_converge():
+
+    for opt_cls, kwargs in [(SGD, dict(lr=0.1, momentum=0.9, nesterov=True)),
+                            (Adam, dict(lr=0.1)),
+                            (AdamW, dict(lr=0.1, weight_decay=0.0))]:
+        params = [Value(0.0) for _ in range(3)]
+        opt = opt_cls(params, **kwargs)
+        for _ in range(300):
+            opt.zero_grad()
+            quadratic(params).backward()
+            opt.step()
+        for i, p in enumerate(params):
+            assert abs(p.data - i) < 1e-2, opt
+
+def test_packed_model_steps_on_buffer():
+
+    random.seed(0)
+    model, packed = MLP(2, [4, 1]), MLP(2, [4, 1])
+    for p, q in zip(model.parameters(), packed.parameters()):
+        q.data = p.data
+    buffer = packed.pack()
+
+    for m in (model, packed):
+        opt = Adam(m.parameters(), lr=0.01)
+        for x in [[1.0, -2.0], [0.5, 0.5]]:
+            opt.zero_grad()
+            m(x).backward()
+            opt.step()
+    assert opt.buffer is buffer
+    assert [p.data for p in model.parameters()] == list(buffer.data)
+    assert [p.data for p in model.parameters()] == [p.data for p in packed.parameters()]
@@ -0,0 +1,42 @@
+import random
+from micrograd.nn import MLP
+from micrograd.parallel import DataParallel
+
+def svm_loss(model, X, y, alpha=1e-4):
+    scores = [model(x) for x in X]
+    losses = [(1 + -yi*scorei).relu() for yi, scorei in zip(y, scores)]
+    return sum(losses) * (1.0 / len(losses)) + alpha * sum((p*p for p in model.parameters()))
+
+def test_data_parallel_matches_single_process():
+
+    random.seed(0)
+    model = MLP(2, [4, 4, 1])
+    X = [[random.uniform(-1, 1), random.uniform(-1, 1)] for _ in range(7)]
+    y = [random.choice([-1.0, 1.0]) for _ in range(7)]
+
+    loss = svm_loss(model, X, y)
+    loss.backward()
+    ref = [p.grad for p in model.parameters()]
+
+    model.zero_grad()
+    with DataParallel(model, svm_loss, processes=3) as dp:
+        total = dp.step(X, y)
+    assert abs(total - loss.data) < 1e-12
+    for g, p in zip(ref, model.parameters()):
+        assert abs(g - p.grad) < 1e-12
+
+def test_data_parallel_packed_model():
+
+    random.seed(0)
+    model = MLP(2, [4, 4, 1])
+    X = [[random.uniform(-1, 1), random.uniform(-1, 1)] for _ in range(5)]
+    y = [random.choice([-1.0, 1.0]) for _ in range(5)]
+    svm_loss(model, X, y).backward()
+    ref = [p.grad for p in model.parameters()]
+
+    buffer = model.pack()
+    model.zero_grad()
+    with DataParallel(model, svm_loss, processes=2) as dp:
+        dp.step(X, y)
+    for g, h, p in zip(ref, buffer.grad, model.parameters()):
+        assert abs(g - h) < 1e-12 and p.grad == h
@@ -0,0 +1,32 @@
+from micrograd.engine import Value, sum as vsum
+from micrograd.passes import optimize
+
+def test_fused_ops():
+    a, b = Value(3.0), Value(-2.0)
+    out = -a + (a - b) * (1 - b) / (a / 4)
+    # one node per op, plus one leaf per wrapped constant
+    assert len(out._build_topo()) == 2 + 2 + 7
+    out.backward()
+    # d/da = -1 + (1 - b) * 4 * (1/a - (a - b)/a**2), d/db = -4 (1 - b)/a - 4 (a - b)/a
+    assert abs(a.grad - (-1 + 3 * 4 * (1/3 - 5/9))) < 1e-12
+    assert abs(b.grad - (-4 * 3/3 - 4 * 5/3)) < 1e-12
+
+def test_optimize():
+    def build(x, y):
+        s = vsum([1.0, 2.0]) * 0.5 # constant only: folded into a single leaf
+        return (x * y + y * x).relu() + (x * y) * s + (x - y) / (x - y)
+
+    x, y = Value(2.0), Value(-3.0)
+    out = build(x, y)
+    before = len(out._build_topo())
+    out.backward()
+    grads = x.grad, y.grad
+
+    x, y = Value(2.0), Value(-3.0)
+    out = build(x, y)
+    opt = optimize(out)
+    assert opt.data == out.data
+    # s's five nodes fold into one, the three x * y / y * x and the two x - y into one each
+    assert len(opt._build_topo()) == before - 4 - 2 - 1
+    opt.backward()
+    assert (x.grad, y.grad) == grads
@@ -0,0 +1,44 @@
+import json
+import random
+from micrograd import engine, nn
+from micrograd.engine import Value
+from micrograd.nn import MLP, Neuron
+from micrograd.profiler import profile
+
+def test_profile_counts():
+    random.seed(0)
+    model = MLP(2, [4, 1])
+    before = (Value.__init__, Value.__mul__, Neuron.__call__, nn.dot, dict(engine._BACKWARD))
+
+    with profile() as prof:
+        x = Value(2.0)
+        y = (x * 3 + model([x, -1.0]))**2
+        y.backward()
+
+    # x * 3 is one '*' node and two allocations, 3 becoming a constant leaf
+    assert (prof.ops['*'].calls, prof.ops['*'].nodes, prof.ops['*'].allocs) == (1, 1, 2)
+    assert prof.ops['**2'].nodes == 1 and prof.ops['**2'].backward > 0
+    assert prof.ops['dot'].nodes == 5 and prof.ops['ReLU'].nodes == 4
+    assert prof.ops['leaf'].nodes == 1
+    assert prof.modules['MLP'].calls == 1 and prof.modules['Neuron'].calls == 5
+    assert prof.modules['Neuron'].nodes == 5 + 5 + 4 # dot, + b and ReLU of the hidden neurons
+    assert prof.modules['MLP'].backward >= prof.modules['Layer'].backward > 0
+    assert 'ReLU' in prof.table() and 'Neuron' in prof.table()
+    trace = json.loads(json.dumps(prof.chrome_trace()))
+    assert {e['name'] for e in trace['traceEvents'] if e['ph'] == 'X'} == {'MLP', 'Layer', 'Neuron', 'backward'}
+
+    # leaving the block puts back exactly what was there
+    assert before == (Value.__init__, Value.__mul__, Neuron.__call__, nn.dot, dict(engine._BACKWARD))
+    assert not hasattr(Value, '__del__')
+
+def test_profile_memory_stays_bounded():
+    random.seed(1)
+    model = MLP(2, [4, 1])
+    with profile() as prof:
+        for _ in range(20):
+            model([0.5, -1.0]).backward()
+        # only the graph that is still alive is tracked, not every node made in the block
+        assert len(prof._owner) == 0
+        y = model([0.5, -1.0])
+        assert 0 < len(prof._owner) == len([v for v in y._build_topo() if v._prev])
+    assert prof.modules['Neuron'].backward > 0
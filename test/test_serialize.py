@@ -0,0 +1,52 @@
+import json
+import pickle
+import random
+import struct
+import pytest
+from micrograd.engine import no_grad
+from micrograd.nn import MLP
+from micrograd.optim import SGD
+from micrograd.serialize import MAGIC, VERSION, save, load
+
+def test_save_load(tmp_path):
+    random.seed(0)
+    model = MLP(3, [8, 8, 2], checkpoint_every=1)
+    path = str(tmp_path / 'mlp.bin')
+    save(model, path)
+    x = [0.5, -1.0, 2.0]
+    expected = [v.data for v in model(x)]
+
+    with no_grad():
+        expected_no_grad = model(x)
+    state = random.getstate()
+    for mmap in (False, True):
+        loaded = load(path, mmap=mmap)
+        assert random.getstate() == state
+        assert loaded.checkpoint_every == 1 and repr(loaded) == repr(model)
+        # inference reads the weights straight from the buffer, without creating any Parameters
+        with no_grad():
+            assert loaded(x) == expected_no_grad
+        assert loaded._buffer._params is None
+        assert [p.data for p in loaded.parameters()] == [p.data for p in model.parameters()]
+        assert [v.data for v in loaded(x)] == expected
+
+    # a memory-mapped model trains (copy-on-write, the file is left alone) and pickles
+    loaded = load(path, mmap=True)
+    assert isinstance(loaded._buffer.data, memoryview)
+    opt = SGD(loaded.parameters(), lr=0.1)
+    loaded(x)[0].backward()
+    opt.step()
+    assert [p.data for p in loaded.parameters()] != [p.data for p in model.parameters()]
+    assert [p.data for p in load(path).parameters()] == [p.data for p in model.parameters()]
+    copy = pickle.loads(pickle.dumps(loaded))
+    assert [p.data for p in copy.parameters()] == [p.data for p in loaded.parameters()]
+
+def test_load_rejects_other_types(tmp_path):
+    # the header names the class to build, which has to be a module that save() can write
+    path = str(tmp_path / 'bad.bin')
+    for name in ('Value', 'Module', 'TensorMLP', 'random'):
+        header = json.dumps({'version': VERSION, 'module': {'type': name}, 'count': 0}).encode()
+        with open(path, 'wb') as f:
+            f.write(MAGIC + struct.pack('<I', len(header)) + header)
+        with pytest.raises(ValueError, match='not a micrograd.nn module'):
+            load(path)
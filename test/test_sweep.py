@@ -0,0 +1,40 @@
+import pickle
+import random
+from micrograd.sweep import SharedDataset, sweep, train_mlp
+
+def scripted(config, data, report):
+    # a fake training run that reports config['metrics'] until told to stop
+    for i, metric in enumerate(config['metrics']):
+        if not report(metric):
+            return {'steps': i + 1}
+    return {'steps': len(config['metrics'])}
+
+def test_shared_dataset():
+    X = [[0.5, -1.0], [2.0, 3.0], [-4.0, 0.25]]
+    with SharedDataset(X, [1, -1, 1]) as data:
+        copy = pickle.loads(pickle.dumps(data)) # attaches to the same memory by name
+        assert copy.batch([2, 0]) == ([X[2], X[0]], [1.0, 1.0])
+        copy.close()
+
+def test_sweep():
+    random.seed(0)
+    X = [[random.uniform(-1, 1), random.uniform(-1, 1)] for _ in range(20)]
+    y = [1.0 if a * b > 0 else -1.0 for a, b in X]
+    configs = [{'nouts': [4, 1], 'steps': 10, 'lr': lr, 'eval_every': 5} for lr in (0.5, 0.05)]
+
+    results = sweep(configs, X, y, processes=2, early_stopping=False)
+    for config, result in zip(configs, results):
+        state = random.getstate()
+        with SharedDataset(X, y) as data:
+            expected = train_mlp(config, data, lambda metric: True)
+        assert random.getstate() == state # the caller's random state is left alone
+        assert result['config'] == config and len(result['history']) == 2
+        assert {k: result[k] for k in expected} == expected
+
+def test_early_stopping():
+    # one process, so the runs go in order and each sees all the earlier ones
+    configs = [{'metrics': [1.0] * 4}] * 3 + [{'metrics': [5.0] * 4}]
+    results = sweep(configs, [[0.0]], [0.0], train_fn=scripted, processes=1, grace=2, min_runs=3)
+    assert [r['steps'] for r in results] == [4, 4, 4, 3]
+    results = sweep(configs, [[0.0]], [0.0], train_fn=scripted, processes=1, early_stopping=False)
+    assert [r['steps'] for r in results] == [4, 4, 4, 4]
@@ -0,0 +1,87 @@
+import random
+import pytest
+from micrograd.engine import Value
+from micrograd.nn import MLP, TensorMLP
+from micrograd.tensor import Tensor
+
+np = pytest.importorskip('numpy')
+
+def test_ops_match_value():
+
+    a, b = Value(-3.0), Value(2.0)
+    c = a * b + b**3
+    d = (c + 1).relu() - a / 2.0
+    e = (d * d).relu() + 10.0 / c
+    e.backward()
+
+    at, bt = Tensor([-3.0]), Tensor([2.0])
+    c = at * bt + bt**3
+    d = (c + 1).relu() - at / 2.0
+    e2 = ((d * d).relu() + 10.0 / c).sum()
+    e2.backward()
+
+    assert e2.data == e.data
+    assert at.grad[0] == a.grad
+    assert bt.grad[0] == b.grad
+
+def test_broadcast_and_matmul():
+
+    x = Tensor(np.arange(6.0).reshape(2, 3))
+    w = Tensor(np.ones((3, 4)))
+    b = Tensor(np.arange(4.0))
+    y = ((x @ w + b) * 2).mean()
+    y.backward()
+    assert b.grad.shape == (4,)
+    assert np.allclose(b.grad, 2 * 2 / 8)
+    assert np.allclose(w.grad, np.repeat(x.data.sum(axis=0)[:, None], 4, axis=1) * 2 / 8)
+    assert np.allclose(x.grad, np.full((2, 3), 4 * 2 / 8))
+
+def test_mlp_matches_scalar():
+
+    random.seed(0)
+    np.random.seed(0)
+    model = MLP(3, [8, 8, 1])
+    tmodel = TensorMLP(3, [8, 8, 1])
+    for layer, tlayer in zip(model.layers, tmodel.layers):
+        tlayer.W.data[:] = [[n.w[i].data for n in layer.neurons] for i in range(len(layer.neurons[0].w))]
+        tlayer.b.data[:] = [n.b.data for n in layer.neurons]
+
+    X = np.random.uniform(-1, 1, (4, 3))
+    loss = sum(model(list(x)) for x in X)
+    loss.backward()
+    tloss = tmodel(X).sum()
+    tloss.backward()
+
+    assert abs(loss.data - tloss.data) < 1e-12
+    for layer, tlayer in zip(model.layers, tmodel.layers):
+        W = [[n.w[i].grad for n in layer.neurons] for i in range(len(layer.neurons[0].w))]
+        assert np.allclose(tlayer.W.grad, W, rtol=0, atol=1e-12)
+        assert np.allclose(tlayer.b.grad, [n.b.grad for n in layer.neurons], rtol=0, atol=1e-12)
+
+    # zero_grad keeps every gradient an array of its parameter's shape
+    tmodel.zero_grad()
+    for p in tmodel.parameters():
+        assert p.grad.shape == p.data.shape and not p.grad.any()
+
+def test_retain_graph():
+
+    # same semantics as Value.backward: interior grads restart from zero, leaves accumulate
+    x = Tensor([1.0, -2.0])
+    y = (x * 2).sum()
+    y.backward(retain_graph=True)
+    y.backward()
+    assert x.grad.tolist() == [4.0, 4.0]
+    try:
+        y.backward()
+        assert False, "expected RuntimeError"
+    except RuntimeError as e:
+        assert 'retain_graph=True' in str(e)
+
+    # a batched MLP loss goes through from_values nodes, which pass gradients on to the Values
+    random.seed(0)
+    model = MLP(2, [4, 1])
+    loss = model(np.array([[0.5, -1.0], [2.0, 0.3]])).sum()
+    loss.backward(retain_graph=True)
+    once = [p.grad for p in model.parameters()]
+    loss.backward()
+    assert [p.grad for p in model.parameters()] == [2 * g for g in once]